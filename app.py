@@ -2,28 +2,32 @@
 DANANTARA Sentiment Analysis - Streamlit App
 """
 
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import nltk
+import time
 
-# Download NLTK data untuk deployment
-@st.cache_resource
-def download_nltk_resources():
-    """Download NLTK data yang diperlukan"""
-    try:
-        nltk.download('punkt', quiet=True)
-        nltk.download('punkt_tab', quiet=True)
-        return True
-    except:
-        return False
+SCRIPT_START = time.perf_counter()
 
-download_nltk_resources()
+import functools
+import hashlib
+import io
+import os
+import sys
+
+import streamlit as st
 
+# Modul ringan saja di awal: utils.model_loader sendiri tidak meng-import
+# numpy, scipy, joblib, maupun emoji. pandas (beserta numpy), plotly.express,
+# dan utils.bulk di-import saat tab bulk / visualisasi memakainya
+# (plotly.graph_objects sudah ikut ter-import oleh streamlit). Model (termasuk
+# stemmer Sastrawi) di-load saat prediksi pertama. Data NLTK tidak pernah
+# di-download di sini.
+_import_start = time.perf_counter()
 import config
-from utils.model_loader import load_models, predict_sentiment
+from utils.model_loader import load_models, predict_sentiment, prefetch_models
+from utils.jobs import JobRunner
+from utils import metrics, startup
+startup.record_import('app', time.perf_counter() - _import_start)
+
+metrics.enable(config.METRICS_ENABLED)
 
 # Page config
 st.set_page_config(
@@ -250,6 +254,76 @@ st.markdown("""
 def init_models():
     return load_models(config)
 
+# Hasil bulk per hash konten file, dibagi antar session
+@st.cache_resource
+def get_result_store():
+    from utils.bulk import ResultStore
+    
+    return ResultStore(config.RESULT_STORE_SIZE)
+
+# Job analisis bulk di background, dibagi antar session
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(config.JOB_WORKERS, config.JOB_HISTORY)
+
+def run_bulk_job(result_store, file_key, models_data, df=None, text_col=None, source=None,
+                 fmt='csv', previous=None, progress_callback=None):
+    """Isi job bulk: analisis file lalu simpan hasil di result_store"""
+    from utils.bulk import analyze_csv_stream, analyze_frame
+    
+    metrics_start = metrics.REGISTRY.snapshot() if metrics.enabled else None
+    if source is not None:
+        entry = analyze_csv_stream(source, config, models_data, progress_callback, fmt)
+        text_results = None
+    else:
+        entry, text_results = analyze_frame(df, text_col, config, models_data, previous, progress_callback)
+    
+    if metrics.enabled:
+        # Breakdown per tahap untuk run ini saja (selisih dari awal job)
+        entry['stages'] = metrics.REGISTRY.stage_summary(metrics_start)
+        if config.METRICS_DUMP_PATH:
+            metrics.dump(config.METRICS_DUMP_PATH)
+    result_store.put(file_key, entry)
+    return text_results
+
+def read_result_file(path):
+    with open(path, 'rb') as result_file:
+        return result_file.read()
+
+def show_result_downloads(entry, key=None):
+    """Tombol download hasil bulk: CSV dan Parquet (dari file hasil streaming atau bytes)"""
+    col1, col2 = st.columns(2)
+    for col, label, data_key, path_key, extension, mime in (
+        (col1, "📥 Download CSV", 'csv', 'output_path', 'csv', 'text/csv'),
+        (col2, "📥 Download Parquet", 'parquet', 'parquet_path', 'parquet', 'application/vnd.apache.parquet'),
+    ):
+        with col:
+            if path_key in entry:
+                # File dibaca saat tombol diklik saja
+                data = functools.partial(read_result_file, entry[path_key])
+            else:
+                data = entry[data_key]
+            st.download_button(
+                label=label,
+                data=data,
+                file_name=f"sentiment_analysis_results.{extension}",
+                mime=mime,
+                key=f"{key}_{data_key}" if key else None
+            )
+
+def cached_per_upload(uploaded_file, name, compute):
+    """``compute()`` sekali per upload (``file_id``), disimpan di session_state
+
+    Script dijalankan ulang di tiap interaksi; kerja berat atas file yang sama
+    tidak perlu diulang selama file tidak diganti.
+    """
+    cache = st.session_state.get('upload_cache')
+    if cache is None or cache['file_id'] != uploaded_file.file_id:
+        cache = st.session_state['upload_cache'] = {'file_id': uploaded_file.file_id}
+    if name not in cache:
+        cache[name] = compute()
+    return cache[name]
+
 # Header
 st.markdown("""
 <div class="header-container">
@@ -287,7 +361,7 @@ with st.sidebar:
     st.markdown("""
     <p style="color: rgba(255,255,255,0.9); font-size: 0.9rem;">
     <b>Single Text:</b> Masukkan teks di tab "Single Text"<br><br>
-    <b>Bulk Analysis:</b> Upload file CSV/Excel di tab "Upload File"<br><br>
+    <b>Bulk Analysis:</b> Upload file CSV/Excel/Parquet di tab "Upload File"<br><br>
     File harus memiliki kolom bernama <code>text</code> atau <code>review</code>
     </p>
     """, unsafe_allow_html=True)
@@ -322,19 +396,26 @@ with tab1:
             st.warning("⚠️ Masukkan teks terlebih dahulu!")
         else:
             with st.spinner("Analyzing..."):
+                # Artifact kedua model yang belum di-load, di-load paralel
+                prefetch_models(models_data)
+                
                 # Predict dengan kedua model
                 result1 = predict_sentiment(
                     text_input,
                     models_data['model_word'],
                     models_data['vectorizer_word'],
-                    models_data['preprocessing']
+                    models_data['preprocessing'],
+                    cache=models_data.prediction_cache,
+                    model_name='word'
                 )
                 
                 result2 = predict_sentiment(
                     text_input,
                     models_data['model_trigram'],
                     models_data['vectorizer_trigram'],
-                    models_data['preprocessing']
+                    models_data['preprocessing'],
+                    cache=models_data.prediction_cache,
+                    model_name='trigram'
                 )
             
             st.markdown("---")
@@ -391,33 +472,65 @@ with tab1:
 # TAB 2: Bulk Analysis
 with tab2:
     st.markdown("### Analisis Sentimen untuk Multiple Teks")
-    st.info("📌 Upload file CSV atau Excel dengan kolom **'text'** atau **'review'**")
+    st.info("📌 Upload file CSV, Excel, Parquet, atau Arrow dengan kolom **'text'** atau **'review'**")
     
     uploaded_file = st.file_uploader(
         "Upload file:",
-        type=['csv', 'xlsx', 'xls'],
+        type=['csv', 'xlsx', 'xls', 'parquet', 'arrow', 'feather'],
         help="File harus memiliki kolom 'text' atau 'review'"
     )
     
     if uploaded_file is not None:
+        # pandas dan utils.bulk baru di-import saat ada file yang di-upload
+        pd = startup.timed_import('pandas')
+        startup.timed_import('utils.bulk')
+        from utils.bulk import STREAM_READERS, find_text_column
+        
         try:
+            # Mode streaming: file CSV/xlsx dibaca per chunk, hasil langsung ditulis ke file
+            file_format = os.path.splitext(uploaded_file.name)[1].lower().lstrip('.')
+            if file_format == 'feather':
+                file_format = 'arrow'
+            streaming = False
+            if file_format in STREAM_READERS:
+                streaming = st.checkbox(
+                    "⚡ Mode streaming (file besar)",
+                    value=uploaded_file.size >= config.STREAMING_DEFAULT_BYTES,
+                    help="Baca, analisis, dan tulis hasil per chunk supaya memory tetap kecil"
+                )
+            
             # Read file
-            if uploaded_file.name.endswith('.csv'):
+            if streaming:
+                # Preview cukup dari chunk pertama, dibaca sekali per upload
+                # (membuka xlsx besar bisa makan beberapa detik di tiap rerun)
+                def read_preview():
+                    reader = STREAM_READERS[file_format](uploaded_file, 10)
+                    try:
+                        return next(reader, pd.DataFrame())
+                    finally:
+                        reader.close()
+                        uploaded_file.seek(0)
+                
+                df = cached_per_upload(uploaded_file, f'preview_{file_format}', read_preview)
+            elif file_format == 'csv':
                 df = pd.read_csv(uploaded_file)
+            elif file_format == 'parquet':
+                df = pd.read_parquet(uploaded_file)
+            elif file_format == 'arrow':
+                df = pd.concat(list(STREAM_READERS['arrow'](uploaded_file, config.BULK_CHUNK_SIZE)) or [pd.DataFrame()])
             else:
                 df = pd.read_excel(uploaded_file)
             
             # Check kolom
-            text_col = None
-            if 'text' in df.columns:
-                text_col = 'text'
-            elif 'review' in df.columns:
-                text_col = 'review'
-            else:
+            text_col = find_text_column(df.columns)
+            if text_col is None:
                 st.error("❌ File harus memiliki kolom 'text' atau 'review'")
                 st.stop()
             
-            st.success(f"✅ File berhasil diupload! Total: {len(df)} baris")
+            if streaming:
+                st.success("✅ File berhasil diupload! (mode streaming)")
+            else:
+                st.success(f"✅ File berhasil diupload! Total: {len(df)} baris")
             
             # Show preview
             with st.expander("👀 Preview Data"):
@@ -427,74 +540,94 @@ with tab2:
             with col2:
                 analyze_bulk_btn = st.button("🚀 Analisis Semua Data", key="bulk")
             
+            # Key hasil: hash konten file + mode, jadi upload ulang file yang sama langsung tampil
+            result_store = get_result_store()
+            job_runner = get_job_runner()
+            content_hash = cached_per_upload(
+                uploaded_file, 'sha1', lambda: hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+            )
+            file_key = (content_hash, streaming)
+            session_jobs = st.session_state.setdefault('bulk_jobs', {})
+            
             if analyze_bulk_btn:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                results_model1 = []
-                results_model2 = []
-                
-                total = len(df)
-                
-                error_count = 0
-                error_data = []  # Track data yang error
-                
-                for idx, row in df.iterrows():
-                    # Update progress
-                    progress = (idx + 1) / total
-                    progress_bar.progress(progress)
-                    status_text.text(f"Processing {idx + 1}/{total}...")
-                    
-                    text = str(row[text_col])
-                    
-                    # Skip teks kosong atau terlalu pendek
-                    if not text or len(text.strip()) < 1:
-                        results_model1.append({'success': False, 'sentiment': 'N/A', 'confidence': 0})
-                        results_model2.append({'success': False, 'sentiment': 'N/A', 'confidence': 0})
-                        error_count += 1
-                        error_data.append({'index': idx, 'text': text, 'reason': 'Teks kosong atau terlalu pendek'})
-                        continue
-                    
-                    # Predict dengan model 1
-                    result1 = predict_sentiment(
-                        text,
-                        models_data['model_word'],
-                        models_data['vectorizer_word'],
-                        models_data['preprocessing']
+                # Analisis jalan di background job; script (dan tab) tidak ikut menunggu
+                if streaming:
+                    job = job_runner.submit(
+                        uploaded_file.name,
+                        run_bulk_job,
+                        result_store,
+                        file_key,
+                        models_data,
+                        source=io.BytesIO(uploaded_file.getvalue()),
+                        fmt=file_format,
+                        key=file_key
                     )
-                    results_model1.append(result1)
-                    
-                    if not result1['success']:
-                        error_count += 1
-                        error_data.append({
-                            'index': idx, 
-                            'text': text[:100] + '...' if len(text) > 100 else text,
-                            'reason': result1.get('error', 'Gagal preprocessing/prediksi')
-                        })
-                    
-                    # Predict dengan model 2
-                    result2 = predict_sentiment(
-                        text,
-                        models_data['model_trigram'],
-                        models_data['vectorizer_trigram'],
-                        models_data['preprocessing']
+                else:
+                    job = job_runner.submit(
+                        uploaded_file.name,
+                        run_bulk_job,
+                        result_store,
+                        file_key,
+                        models_data,
+                        df=df,
+                        text_col=text_col,
+                        previous=st.session_state.get('bulk_text_results'),
+                        key=file_key
                     )
-                    results_model2.append(result2)
+                session_jobs[job.id] = file_key
+                st.session_state['bulk_metrics_start'] = metrics.REGISTRY.snapshot() if metrics.enabled else None
+            
+            # Job terakhir session ini untuk file yang sedang di-upload
+            job = job_runner.get(next(
+                (job_id for job_id, key in reversed(session_jobs.items()) if key == file_key), None
+            ))
+            
+            if job is not None and job.active:
+                st.info(f"⏳ Job `{job.id}` berjalan di background. Tab boleh ditutup; ambil hasilnya nanti lewat ID job ini.")
                 
-                progress_bar.empty()
-                status_text.empty()
+                # Polling progress dengan interval tetap, bukan update per baris
+                @st.fragment(run_every=config.JOB_POLL_SECONDS)
+                def show_job_progress():
+                    if not job.active:
+                        st.rerun()
+                    if job.fraction is not None:
+                        st.progress(job.fraction, text=f"Processing {job.done}/{job.total}...")
+                    else:
+                        st.progress(0, text=f"Processing {job.done} baris...")
+                    
+                    # Breakdown per tahap sejauh ini (hanya jika metrics aktif)
+                    if metrics.enabled and st.session_state.get('bulk_metrics_start') is not None:
+                        stages = metrics.REGISTRY.stage_summary(st.session_state['bulk_metrics_start'])
+                        if stages:
+                            st.caption(' · '.join(
+                                f"{stage}: {summary['seconds']:.1f}s" for stage, summary in stages.items()
+                            ))
                 
-                # Compile results
-                df['sentiment_model1'] = [r.get('sentiment', 'N/A') if r['success'] else 'N/A' for r in results_model1]
-                df['confidence_model1'] = [r.get('confidence', 0) if r['success'] else 0 for r in results_model1]
-                df['sentiment_model2'] = [r.get('sentiment', 'N/A') if r['success'] else 'N/A' for r in results_model2]
-                df['confidence_model2'] = [r.get('confidence', 0) if r['success'] else 0 for r in results_model2]
+                show_job_progress()
+            
+            elif job is not None and job.status == 'failed':
+                st.error(f"❌ Error: {job.error}")
+            
+            elif job is not None and job.result is not None:
+                # Hasil per teks unik untuk analisis ulang file yang diedit
+                st.session_state['bulk_text_results'] = job.result
+            
+            # Tampilkan hasil tersimpan: rerun karena klik widget tidak menghitung ulang
+            bulk_result = result_store.get(file_key)
+            if bulk_result is not None and not (job is not None and job.active):
+                summary = bulk_result['summary']
+                error_data = bulk_result['errors']
+                if 'stages' in bulk_result:
+                    st.session_state['last_bulk_stages'] = bulk_result['stages']
                 
-                st.success("✅ Analisis selesai!")
+                st.success(f"✅ Analisis selesai! Total: {summary['rows']} baris ({summary['seconds']:.1f} detik)")
+                st.caption(f"Duplikat: {summary['dedup_ratio'] * 100:.1f}% — {summary['unique']} teks unik dianalisis")
+                if summary.get('reused'):
+                    st.caption(f"♻️ {summary['reused']} teks unik memakai hasil analisis sebelumnya")
                 
                 # Tampilkan warning jika ada error
-                if error_count > 0:
-                    st.warning(f"⚠️ {error_count} data gagal diproses (teks kosong atau terlalu pendek)")
+                if summary['error_count'] > 0:
+                    st.warning(f"⚠️ {summary['error_count']} data gagal diproses (teks kosong atau terlalu pendek)")
                     
                     # Dropdown untuk lihat data error
                     with st.expander("🔍 Lihat data yang gagal diproses"):
@@ -504,101 +637,83 @@ with tab2:
                             st.dataframe(error_df, use_container_width=True, height=300)
                             
                             # Info tambahan
-                            st.caption(f"Total: {len(error_df)} data gagal diproses")
+                            st.caption(f"Menampilkan {len(error_df)} dari {summary['error_count']} data gagal diproses")
                         else:
                             st.info("Tidak ada detail error tersedia")
                 
                 st.markdown("---")
                 st.markdown("## 📊 Hasil Analisis")
                 
-                # Filter out N/A untuk visualisasi
-                df_valid = df[(df['sentiment_model1'] != 'N/A') & (df['sentiment_model2'] != 'N/A')]
+                valid_count = summary['valid']
+                pos_model1 = summary['positif_model1']
+                pos_model2 = summary['positif_model2']
+                neg_model1 = valid_count - pos_model1
+                neg_model2 = valid_count - pos_model2
                 
                 # Metrics
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    st.metric("Total Data", len(df))
+                    st.metric("Total Data", summary['rows'])
                 
                 with col2:
-                    pos_model1 = (df_valid['sentiment_model1'] == 'Positif').sum()
                     st.metric("Model 1: Positif", pos_model1)
                 
                 with col3:
-                    pos_model2 = (df_valid['sentiment_model2'] == 'Positif').sum()
                     st.metric("Model 2: Positif", pos_model2)
                 
                 with col4:
-                    if len(df_valid) > 0:
-                        agreement = (df_valid['sentiment_model1'] == df_valid['sentiment_model2']).sum()
-                        agreement_pct = (agreement / len(df_valid)) * 100
+                    if valid_count > 0:
+                        agreement_pct = (summary['agreement'] / valid_count) * 100
                         st.metric("Kesepakatan", f"{agreement_pct:.1f}%")
                     else:
                         st.metric("Kesepakatan", "N/A")
                 
-                # Visualizations
+                # Visualizations (mode streaming: dari agregat per chunk)
                 st.markdown("### 📈 Visualisasi")
                 
+                px = startup.timed_import('plotly.express')
+                go = startup.timed_import('plotly.graph_objects')
+                # Sudah ter-import bersama pandas di atas
+                import numpy as np
+                
                 tab_viz1, tab_viz2, tab_viz3 = st.tabs(["Distribution", "Comparison", "Confidence"])
                 
                 with tab_viz1:
-                    if len(df_valid) > 0:
+                    if valid_count > 0:
                         col1, col2 = st.columns(2)
                         
-                        with col1:
-                            # Model 1 distribution
-                            sentiment_counts1 = df_valid['sentiment_model1'].value_counts()
-                            fig1 = px.pie(
-                                values=sentiment_counts1.values,
-                                names=sentiment_counts1.index,
-                                title="Model 1: Distribusi Sentimen",
-                                color=sentiment_counts1.index,
-                                color_discrete_map={'Positif': '#38ef7d', 'Negatif': '#f45c43'}
-                            )
-                            fig1.update_traces(textinfo='percent+label', textfont_size=14)
-                            st.plotly_chart(fig1, use_container_width=True)
-                        
-                        with col2:
-                            # Model 2 distribution
-                            sentiment_counts2 = df_valid['sentiment_model2'].value_counts()
-                            fig2 = px.pie(
-                                values=sentiment_counts2.values,
-                                names=sentiment_counts2.index,
-                                title="Model 2: Distribusi Sentimen",
-                                color=sentiment_counts2.index,
-                                color_discrete_map={'Positif': '#38ef7d', 'Negatif': '#f45c43'}
-                            )
-                            fig2.update_traces(textinfo='percent+label', textfont_size=14)
-                            st.plotly_chart(fig2, use_container_width=True)
+                        for col, model_label, positif, negatif in (
+                            (col1, "Model 1", pos_model1, neg_model1),
+                            (col2, "Model 2", pos_model2, neg_model2),
+                        ):
+                            with col:
+                                fig = px.pie(
+                                    values=[positif, negatif],
+                                    names=['Positif', 'Negatif'],
+                                    title=f"{model_label}: Distribusi Sentimen",
+                                    color=['Positif', 'Negatif'],
+                                    color_discrete_map={'Positif': '#38ef7d', 'Negatif': '#f45c43'}
+                                )
+                                fig.update_traces(textinfo='percent+label', textfont_size=14)
+                                st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.warning("⚠️ Tidak ada data valid untuk divisualisasi")
                 
                 with tab_viz2:
-                    if len(df_valid) > 0:
+                    if valid_count > 0:
                         # Comparison bar chart
-                        comparison_data = pd.DataFrame({
-                            'Model': ['Model 1', 'Model 2'],
-                            'Positif': [
-                                (df_valid['sentiment_model1'] == 'Positif').sum(),
-                                (df_valid['sentiment_model2'] == 'Positif').sum()
-                            ],
-                            'Negatif': [
-                                (df_valid['sentiment_model1'] == 'Negatif').sum(),
-                                (df_valid['sentiment_model2'] == 'Negatif').sum()
-                            ]
-                        })
-                        
                         fig3 = go.Figure()
                         fig3.add_trace(go.Bar(
                             name='Positif',
-                            x=comparison_data['Model'],
-                            y=comparison_data['Positif'],
+                            x=['Model 1', 'Model 2'],
+                            y=[pos_model1, pos_model2],
                             marker_color='#38ef7d'
                         ))
                         fig3.add_trace(go.Bar(
                             name='Negatif',
-                            x=comparison_data['Model'],
-                            y=comparison_data['Negatif'],
+                            x=['Model 1', 'Model 2'],
+                            y=[neg_model1, neg_model2],
                             marker_color='#f45c43'
                         ))
                         
@@ -615,42 +730,37 @@ with tab2:
                         st.warning("⚠️ Tidak ada data valid untuk divisualisasi")
                 
                 with tab_viz3:
-                    if len(df_valid) > 0:
+                    if valid_count > 0:
                         col1, col2 = st.columns(2)
                         
-                        with col1:
-                            # Model 1 confidence distribution (exclude 0)
-                            df_conf1 = df_valid[df_valid['confidence_model1'] > 0]
-                            if len(df_conf1) > 0:
-                                fig4 = px.histogram(
-                                    df_conf1,
-                                    x='confidence_model1',
-                                    nbins=20,
-                                    title="Model 1: Distribusi Confidence",
-                                    labels={'confidence_model1': 'Confidence (%)'},
-                                    color_discrete_sequence=['#667eea']
-                                )
-                                fig4.update_layout(showlegend=False)
-                                st.plotly_chart(fig4, use_container_width=True)
-                            else:
-                                st.info("Tidak ada data confidence untuk Model 1")
-                        
-                        with col2:
-                            # Model 2 confidence distribution (exclude 0)
-                            df_conf2 = df_valid[df_valid['confidence_model2'] > 0]
-                            if len(df_conf2) > 0:
-                                fig5 = px.histogram(
-                                    df_conf2,
-                                    x='confidence_model2',
-                                    nbins=20,
-                                    title="Model 2: Distribusi Confidence",
-                                    labels={'confidence_model2': 'Confidence (%)'},
-                                    color_discrete_sequence=['#764ba2']
-                                )
-                                fig5.update_layout(showlegend=False)
-                                st.plotly_chart(fig5, use_container_width=True)
-                            else:
-                                st.info("Tidak ada data confidence untuk Model 2")
+                        for col, model_label, suffix, color in (
+                            (col1, "Model 1", 'model1', '#667eea'),
+                            (col2, "Model 2", 'model2', '#764ba2'),
+                        ):
+                            with col:
+                                # Histogram confidence (exclude 0), sudah di-bin dengan NumPy
+                                hist = summary['confidence_hist'][suffix]
+                                if hist is not None:
+                                    counts, edges = hist
+                                    # Bin tetap 50-100; bin kosong di kedua ujung tidak ditampilkan
+                                    used = np.flatnonzero(counts)
+                                    counts = counts[used[0]:used[-1] + 1]
+                                    edges = edges[used[0]:used[-1] + 2]
+                                    fig = go.Figure(go.Bar(
+                                        x=(edges[:-1] + edges[1:]) / 2,
+                                        y=counts,
+                                        width=np.diff(edges),
+                                        marker_color=color
+                                    ))
+                                    fig.update_layout(
+                                        title=f"{model_label}: Distribusi Confidence",
+                                        xaxis_title='Confidence (%)',
+                                        yaxis_title='count',
+                                        showlegend=False
+                                    )
+                                    st.plotly_chart(fig, use_container_width=True)
+                                else:
+                                    st.info(f"Tidak ada data confidence untuk {model_label}")
                     else:
                         st.warning("⚠️ Tidak ada data valid untuk divisualisasi")
                 
@@ -658,17 +768,75 @@ with tab2:
                 st.markdown("---")
                 st.markdown("### 💾 Download Hasil")
                 
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Download CSV",
-                    data=csv,
-                    file_name="sentiment_analysis_results.csv",
-                    mime="text/csv"
-                )
-                
+                show_result_downloads(bulk_result)
+        
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
 
+# TAB 2: daftar job bulk (hasil tetap bisa diambil setelah tab ditutup)
+with tab2:
+    with st.expander("📋 Job Analisis"):
+        job_runner = get_job_runner()
+        lookup_id = st.text_input("Ambil hasil dengan ID job:", key="job_lookup")
+        
+        job_ids = list(reversed(st.session_state.get('bulk_jobs', {})))
+        if lookup_id and lookup_id.strip() not in job_ids:
+            job_ids.insert(0, lookup_id.strip())
+        
+        for job_id in job_ids:
+            job = job_runner.get(job_id)
+            if job is None:
+                st.caption(f"`{job_id}`: tidak ditemukan")
+                continue
+            
+            status = {'queued': '🕒 antre', 'running': '⏳ berjalan', 'done': '✅ selesai', 'failed': '❌ gagal'}
+            st.caption(f"`{job.id}` — {job.name}: {status[job.status]} ({job.seconds:.1f} detik)")
+            
+            entry = get_result_store().get(job.key) if job.status == 'done' else None
+            if entry is not None:
+                show_result_downloads(entry, key=f"job_download_{job.id}")
+
+# Sidebar - waktu load & memory per artifact (hanya yang sudah di-load)
+timings = getattr(models_data, 'timings', {})
+if timings:
+    with st.sidebar:
+        with st.expander("⏱️ Load Model"):
+            for key, timing in list(timings.items()):
+                st.caption(
+                    f"**{key}**: {timing['seconds']:.2f} detik, "
+                    f"{timing['memory_bytes'] / 1e6:.1f} MB (file {timing['file_bytes'] / 1e6:.1f} MB)"
+                )
+
+# Sidebar - waktu per tahap analisis bulk terakhir (jika METRICS_ENABLED)
+last_stages = st.session_state.get('last_bulk_stages')
+if last_stages:
+    with st.sidebar:
+        with st.expander("🔬 Profiling Bulk Terakhir"):
+            pd = startup.timed_import('pandas')
+            st.caption("preprocess_batch sudah mencakup strip_emoji s/d stem")
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        'Tahap': stage,
+                        'Detik': round(summary['seconds'], 3),
+                        'ms/panggilan': round(summary['mean_ms'], 3)
+                    }
+                    for stage, summary in sorted(last_stages.items(), key=lambda item: -item[1]['seconds'])
+                ]),
+                hide_index=True,
+                use_container_width=True
+            )
+
+# Sidebar - waktu startup process ini (run script pertama + import modul berat)
+if startup.record_first_render(time.perf_counter() - SCRIPT_START):
+    print(startup.format_report(), file=sys.stderr)
+startup_report = startup.report()
+with st.sidebar:
+    with st.expander("🚀 Startup"):
+        st.caption(f"**Run script pertama**: {startup_report['first_render']:.2f} detik")
+        for name, seconds in startup_report['imports'].items():
+            st.caption(f"**import {name}**: {seconds:.2f} detik")
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -11,3 +11,63 @@ VECTORIZER_WORD_PATH = os.path.join(MODELS_DIR, 'vectorizer_word_based.joblib')
 MODEL_TRIGRAM_PATH = os.path.join(MODELS_DIR, 'model_trigram.joblib')
 VECTORIZER_TRIGRAM_PATH = os.path.join(MODELS_DIR, 'vectorizer_trigram.joblib')
 PREPROCESSING_PATH = os.path.join(MODELS_DIR, 'preprocessing_tools.joblib')
+# Tabel token -> hasil normalisasi/stopword/stem (python -m utils.token_table); opsional
+TOKEN_TABLE_PATH = os.path.join(MODELS_DIR, 'token_table.joblib')
+
+# Jumlah maksimum word -> stem yang disimpan di cache stemming (LRU)
+STEM_CACHE_SIZE = 100000
+
+# Tokenizer: 'fast' (tanpa NLTK, hasil identik) atau 'nltk' (word_tokenize + data punkt)
+TOKENIZER = 'fast'
+
+# Data NLTK vendored untuk TOKENIZER = 'nltk' (isi dengan python -m utils.vendor_nltk)
+NLTK_DATA_DIR = os.path.join(BASE_DIR, 'nltk_data')
+# Mode offline (pod air-gapped): data NLTK tidak pernah di-download saat runtime
+OFFLINE = False
+
+# Bulk scoring: jumlah worker process (None = semua core) dan baris per chunk
+BULK_WORKERS = None
+BULK_CHUNK_SIZE = 2000
+
+# Upload CSV/xlsx sebesar ini ke atas default memakai mode streaming di app
+STREAMING_DEFAULT_BYTES = 20 * 1024 * 1024
+
+# HTTP inference server (python -m utils.server)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8000
+# Micro-batching: request single-text dikumpulkan maksimal sekian ms / sekian text
+MICROBATCH_MAX_WAIT_MS = 5
+MICROBATCH_MAX_SIZE = 256
+
+# Load model saat pertama dipakai (True) atau semua di awal secara paralel (False)
+LAZY_LOAD = True
+
+# Format model: 'joblib' (pickle) atau 'compact' (array .npy memory-mapped,
+# buat dengan: python -m utils.compact)
+MODEL_FORMAT = 'joblib'
+COMPACT_DIR = os.path.join(MODELS_DIR, 'compact')
+
+# Varian model per nama ('word' / 'trigram') -> folder compact, menggantikan
+# MODEL_FORMAT untuk model itu. Varian pruned dibuat dengan python -m utils.prune,
+# mis. {'trigram': os.path.join(MODELS_DIR, 'pruned', 'trigram')}
+MODEL_VARIANTS = {}
+
+# Cache prediksi persisten (SQLite); None = tidak dipakai. Otomatis dikosongkan
+# jika ada artifact di MODELS_DIR yang berubah.
+PREDICTION_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'predictions.sqlite3')
+PREDICTION_CACHE_MAX_ENTRIES = 1000000
+
+# Jumlah hasil analisis bulk (per hash konten file) yang disimpan di server
+RESULT_STORE_SIZE = 8
+
+# Job analisis bulk di background: jumlah job paralel, jumlah job selesai
+# yang disimpan, dan interval polling progress di UI (detik)
+JOB_WORKERS = 1
+JOB_HISTORY = 50
+JOB_POLL_SECONDS = 1.0
+
+# Metrics per tahap (preprocessing, vectorize, score). Mati = hampir tanpa
+# overhead. Jika METRICS_DUMP_PATH diisi, app menulis teks Prometheus ke
+# file itu setiap analisis bulk selesai.
+METRICS_ENABLED = False
+METRICS_DUMP_PATH = None
@@ -0,0 +1,41 @@
+import os
+import sys
+
+# Test dijalankan dari root repo maupun dari folder tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+DOCUMENTS = [
+    'aplikasi danantara bagus sekali untuk investasi',
+    'pelayanan buruk dan lambat sekali',
+    'investasi bumn makin transparan bagus',
+    'korupsi lagi rakyat rugi buruk',
+    'dana negara dikelola profesional',
+    'tidak percaya pengelolaan dana buruk',
+    'mantap semoga ekonomi tumbuh',
+    'kecewa berat lambat',
+]
+LABELS = [1, 0, 1, 0, 1, 0, 1, 0]
+
+
+@pytest.fixture(scope='session')
+def nb_pair():
+    """(TfidfVectorizer trigram, MultinomialNB) kecil yang dilatih di DOCUMENTS"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    
+    vectorizer = TfidfVectorizer(ngram_range=(1, 3))
+    model = MultinomialNB().fit(vectorizer.fit_transform(DOCUMENTS), LABELS)
+    return vectorizer, model
+
+
+@pytest.fixture(scope='session')
+def test_config():
+    """Salinan config tanpa cache prediksi (tidak menulis ke cache/ repo)"""
+    import config
+    from utils.bulk import config_snapshot
+    
+    snapshot = config_snapshot(config)
+    snapshot.PREDICTION_CACHE_PATH = None
+    return snapshot
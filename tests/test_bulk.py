@@ -0,0 +1,139 @@
+"""Summary hasil bulk: mode streaming harus sama dengan mode in-memory"""
+
+import io
+
+import numpy as np
+import pytest
+
+from utils.bulk import CONFIDENCE_EDGES, score_csv_stream
+from utils.model_loader import load_models
+
+TEXTS = [
+    'aplikasi danantara bagus sekali untuk investasi',
+    'pelayanan buruk dan lambat sekali',
+    'investasi bumn makin transparan',
+    'korupsi lagi rakyat rugi',
+    'a',
+    'ok',
+    'semoga ekonomi indonesia tumbuh pesat',
+    'kecewa berat dengan pengelolaan dana',
+] * 5
+
+
+@pytest.fixture(scope='module')
+def models_data(test_config):
+    models_data = load_models(test_config)
+    if not models_data['loaded']:
+        pytest.skip(f"Model tidak bisa di-load: {models_data['error']}")
+    return models_data
+
+
+READERS = {
+    'csv': ('to_csv', 'read_csv'),
+    'xlsx': ('to_excel', 'read_excel'),
+}
+
+
+@pytest.mark.parametrize('fmt', list(READERS))
+def test_streaming_summary_matches_in_memory(models_data, test_config, tmp_path, fmt):
+    pd = pytest.importorskip('pandas')
+    if fmt == 'xlsx':
+        pytest.importorskip('openpyxl')
+    from utils.bulk import analyze_frame
+    
+    # Baris dengan sel teks kosong (dan kolom lain terisi) di tengah file
+    texts = TEXTS[:3] + [None] + TEXTS[3:] + [None]
+    df = pd.DataFrame({
+        'id': range(len(texts)),
+        'text': texts,
+        # Kolom campuran (object) dengan sel kosong
+        'catatan': [None if i % 4 else (i if i % 8 else f'catatan {i}') for i in range(len(texts))],
+    })
+    source = tmp_path / f'input.{fmt}'
+    writer, reader = READERS[fmt]
+    getattr(df, writer)(source, index=False)
+    
+    # Reader streaming memberi DataFrame yang sama dengan reader in-memory
+    from utils.bulk import STREAM_READERS
+    
+    pd.testing.assert_frame_equal(
+        pd.concat(list(STREAM_READERS[fmt](str(source), 7))), getattr(pd, reader)(source)
+    )
+    
+    stats = score_csv_stream(
+        str(source), str(tmp_path / 'output.csv'), test_config, models_data, chunksize=7, fmt=fmt, workers=1
+    )
+    in_memory = getattr(pd, reader)(source)
+    entry, _ = analyze_frame(in_memory, 'text', test_config, models_data)
+    summary = entry['summary']
+    
+    for key in ('rows', 'error_count', 'valid', 'positif_model1', 'positif_model2', 'agreement'):
+        assert stats[key] == summary[key], key
+    assert stats['errors'] == entry['errors']
+    for suffix, hist in summary['confidence_hist'].items():
+        assert hist is not None
+        counts, edges = stats['confidence_hist'][suffix]
+        np.testing.assert_array_equal(counts, hist[0])
+        np.testing.assert_array_equal(edges, CONFIDENCE_EDGES)
+        assert counts.sum() == summary['valid']
+    
+    streamed = pd.read_csv(tmp_path / 'output.csv', keep_default_na=False)
+    expected = pd.read_csv(io.BytesIO(entry['csv']), keep_default_na=False)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_blank_cells_are_empty_text_errors(models_data, test_config, tmp_path):
+    pd = pytest.importorskip('pandas')
+    from utils.bulk import analyze_frame
+    
+    df = pd.DataFrame({'text': ['aplikasi bagus sekali', None, np.nan, 'pelayanan buruk', '']})
+    entry, _ = analyze_frame(df.copy(), 'text', test_config, models_data)
+    assert entry['summary']['error_count'] == 3
+    assert entry['summary']['valid'] == 2
+    assert {error['reason'] for error in entry['errors']} == {'Teks kosong atau terlalu pendek'}
+    
+    source = tmp_path / 'input.csv'
+    df.to_csv(source, index=False)
+    output = tmp_path / 'output.csv'
+    stats = score_csv_stream(str(source), str(output), test_config, models_data, chunksize=2, workers=1)
+    assert stats['error_count'] == 3
+    assert stats['valid'] == 2
+    sentiments = pd.read_csv(output, keep_default_na=False)['sentiment_model1'].tolist()
+    assert sentiments[1:3] == ['N/A', 'N/A']
+
+
+def test_failed_chunk_closes_parquet_writer(models_data, test_config, tmp_path, monkeypatch):
+    pd = pytest.importorskip('pandas')
+    pq = pytest.importorskip('pyarrow.parquet')
+    import utils.bulk
+    
+    def failing_reader(source, chunksize):
+        yield pd.DataFrame({'text': TEXTS[:chunksize]})
+        raise ValueError('chunk rusak')
+    
+    monkeypatch.setitem(utils.bulk.STREAM_READERS, 'csv', failing_reader)
+    closed = []
+    close = utils.bulk.ParquetChunkWriter.close
+    monkeypatch.setattr(
+        utils.bulk.ParquetChunkWriter, 'close', lambda self: closed.append(self.rows) or close(self)
+    )
+    parquet_path = tmp_path / 'output.parquet'
+    with pytest.raises(ValueError, match='chunk rusak'):
+        score_csv_stream(
+            'input.csv', str(tmp_path / 'output.csv'), test_config, models_data,
+            chunksize=7, workers=1, parquet_path=str(parquet_path)
+        )
+    
+    # Writer ditutup eksplisit: footer tertulis, chunk yang berhasil bisa dibaca
+    assert closed == [7]
+    assert pq.read_table(parquet_path).num_rows == 7
+
+
+def test_confidence_histogram_covers_every_score(models_data, test_config):
+    from utils.bulk import analyze_frame
+    pd = pytest.importorskip('pandas')
+    
+    entry, _ = analyze_frame(pd.DataFrame({'text': TEXTS}), 'text', test_config, models_data)
+    for suffix, (counts, edges) in entry['summary']['confidence_hist'].items():
+        assert (edges[0], edges[-1], len(counts)) == (50, 100, 20)
+        assert counts.sum() == entry['summary']['valid']
@@ -0,0 +1,57 @@
+"""PredictionCache: invalidasi per fingerprint model dan eviction LRU"""
+
+import types
+
+import utils.cache
+from utils.cache import PredictionCache, models_fingerprint, open_prediction_cache
+from utils.compact import export_pair
+
+ROWS = [('bagus', 1, 0.2, 0.8), ('buruk', 0, 0.9, 0.1)]
+
+
+def test_changed_models_fingerprint_invalidates_entries(test_config, nb_pair, tmp_path):
+    config = types.SimpleNamespace(**vars(test_config))
+    config.PREDICTION_CACHE_PATH = str(tmp_path / 'predictions.sqlite3')
+    config.MODEL_VARIANTS = {}
+    
+    cache = open_prediction_cache(config)
+    cache.put_many('trigram', ROWS)
+    cache.close()
+    
+    # Artifact sama: entry lama tetap terpakai
+    cache = open_prediction_cache(config)
+    assert cache.get_many('trigram', ['bagus', 'buruk']) == {text: tuple(row) for text, *row in ROWS}
+    cache.close()
+    
+    # Varian trigram menunjuk ke artifact lain: fingerprint berubah, cache dikosongkan
+    variant = tmp_path / 'variant'
+    export_pair(*nb_pair, str(variant), 'trigram')
+    fingerprint = models_fingerprint(config)
+    config.MODEL_VARIANTS = {'trigram': str(variant)}
+    assert models_fingerprint(config) != fingerprint
+    
+    cache = open_prediction_cache(config)
+    assert cache.get_many('trigram', ['bagus', 'buruk']) == {}
+    assert cache.stats()['size'] == 0
+    cache.close()
+
+
+def test_eviction_trims_to_90_percent_dropping_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1, 1000))
+    monkeypatch.setattr(utils.cache, 'time', types.SimpleNamespace(time=lambda: next(clock)))
+    cache = PredictionCache(str(tmp_path / 'predictions.sqlite3'), 'fingerprint', max_entries=10)
+    
+    texts = [f'teks {i}' for i in range(11)]
+    for text in texts[:10]:
+        cache.put_many('word', [(text, 1, 0.4, 0.6)])
+    assert cache.stats()['evictions'] == 0
+    
+    # teks 0 dipakai lagi, jadi yang paling lama tidak dipakai: teks 1 dan teks 2
+    assert set(cache.get_many('word', [texts[0]])) == {texts[0]}
+    cache.put_many('word', [(texts[10], 0, 0.7, 0.3)])
+    
+    stats = cache.stats()
+    assert stats['size'] == 9
+    assert stats['evictions'] == 2
+    assert set(cache.get_many('word', texts)) == set(texts) - {texts[1], texts[2]}
+    cache.close()
@@ -0,0 +1,106 @@
+"""FusedVectorizer harus identik dengan transform tiap vectorizer"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from conftest import DOCUMENTS
+from utils.compact import CompactVectorizer, export_pair
+from utils.features import FusedVectorizer
+
+QUERIES = DOCUMENTS + [
+    '',
+    ' ',
+    'bagus',
+    'a',
+    'sangat bagus',
+    'a b',
+    '!!! ???',
+    'investasi bumn investasi bumn investasi',
+    'kata yang tidak ada di vocabulary',
+]
+
+NGRAM_RANGES = {'word_based': (1, 1), 'bigram': (2, 2), 'trigram': (1, 3)}
+
+
+@pytest.fixture(scope='module')
+def vectorizers():
+    return {name: TfidfVectorizer(ngram_range=ngram_range).fit(DOCUMENTS) for name, ngram_range in NGRAM_RANGES.items()}
+
+
+@pytest.fixture(scope='module')
+def compact_vectorizers(vectorizers, tmp_path_factory, nb_pair):
+    _, model = nb_pair
+    compact = {}
+    for name, vectorizer in vectorizers.items():
+        directory = str(tmp_path_factory.mktemp(name))
+        # Model hanya ikut di-export; kolomnya tidak dipakai oleh vectorizer
+        export_pair(vectorizer, model, directory, name)
+        compact[name] = CompactVectorizer(directory)
+    return compact
+
+
+def assert_identical(vectorizers, documents):
+    features = FusedVectorizer(vectorizers).transform(documents)
+    assert set(features) == set(vectorizers)
+    for name, vectorizer in vectorizers.items():
+        expected = vectorizer.transform(documents)
+        actual = features[name]
+        assert actual.shape == expected.shape, name
+        np.testing.assert_array_equal(actual.indptr, expected.indptr, err_msg=name)
+        np.testing.assert_array_equal(actual.indices, expected.indices, err_msg=name)
+        np.testing.assert_array_equal(actual.data, expected.data, err_msg=name)
+
+
+@pytest.mark.parametrize('documents', [QUERIES, ['', ''], ['bagus'], ['a b']])
+def test_fused_matches_joblib_vectorizers(vectorizers, documents):
+    assert_identical(vectorizers, documents)
+
+
+@pytest.mark.parametrize('documents', [QUERIES, ['', ''], ['bagus'], ['a b']])
+def test_fused_matches_compact_vectorizers(compact_vectorizers, documents):
+    assert_identical(compact_vectorizers, documents)
+
+
+def test_fused_matches_mixed_vectorizers(vectorizers, compact_vectorizers):
+    mixed = {'word_based': vectorizers['word_based'], 'trigram': compact_vectorizers['trigram']}
+    assert_identical(mixed, QUERIES)
+
+
+def test_non_standard_analyzer_is_transformed_separately(vectorizers):
+    char = TfidfVectorizer(analyzer='char', ngram_range=(2, 3)).fit(DOCUMENTS)
+    mixed = {'trigram': vectorizers['trigram'], 'char': char}
+    assert set(FusedVectorizer(mixed).separate) == {'char'}
+    assert_identical(mixed, QUERIES)
+
+
+@pytest.mark.parametrize('options', [
+    {'sublinear_tf': True},
+    {'use_idf': False},
+    {'smooth_idf': False, 'norm': 'l1'},
+    {'norm': None},
+    {'dtype': np.float32},
+])
+def test_fused_matches_tfidf_options(options):
+    vectorizers = {
+        'word_based': TfidfVectorizer(**options).fit(DOCUMENTS),
+        'trigram': TfidfVectorizer(ngram_range=(1, 3), **options).fit(DOCUMENTS),
+    }
+    assert set(FusedVectorizer(vectorizers).fused) == set(vectorizers)
+    assert_identical(vectorizers, QUERIES)
+
+
+class RenamedIdfVectorizer(TfidfVectorizer):
+    """Seolah versi sklearn lain tanpa atribut ``idf_``"""
+    
+    @property
+    def idf_(self):
+        raise AttributeError('idf_')
+
+
+def test_missing_idf_attribute_falls_back_to_transform(vectorizers):
+    renamed = RenamedIdfVectorizer(ngram_range=(1, 3)).fit(DOCUMENTS)
+    mixed = {'word_based': vectorizers['word_based'], 'trigram': renamed}
+    fused = FusedVectorizer(mixed)
+    assert set(fused.separate) == {'trigram'}
+    assert_identical(mixed, QUERIES)
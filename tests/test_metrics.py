@@ -0,0 +1,24 @@
+"""Render metrics Prometheus"""
+
+import pytest
+
+from utils import metrics
+from utils.model_loader import ModelStore
+
+
+def test_cache_gauges_are_unique_per_store(test_config):
+    stores = [ModelStore(test_config), ModelStore(test_config)]
+    for store in stores:
+        try:
+            store['preprocessing']
+        except Exception as e:
+            pytest.skip(f"Preprocessing tidak bisa di-load: {e}")
+    
+    series = [
+        line.rsplit(' ', 1)[0] for line in metrics.REGISTRY.render().splitlines()
+        if line.startswith('sentiment_stem_cache{')
+    ]
+    assert series
+    assert len(series) == len(set(series))
+    for store in stores:
+        assert any(f'store="{store._store_id}"' in line for line in series)
@@ -0,0 +1,29 @@
+"""Lazy ModelStore: artifact yang dibutuhkan satu pemakaian di-load paralel sekaligus"""
+
+import pytest
+
+from utils.model_loader import ModelStore, load_models, predict_sentiment_batch
+
+
+@pytest.mark.parametrize('models, expected', [
+    (('word',), {'preprocessing', 'model_word', 'vectorizer_word'}),
+    (('word', 'trigram'), {
+        'preprocessing', 'model_word', 'vectorizer_word', 'model_trigram', 'vectorizer_trigram'
+    }),
+])
+def test_batch_prefetches_only_needed_artifacts(test_config, monkeypatch, models, expected):
+    models_data = load_models(test_config, lazy=True)
+    if not models_data['loaded']:
+        pytest.skip(f"Model tidak bisa di-load: {models_data['error']}")
+    
+    calls = []
+    prefetch = ModelStore.prefetch
+    monkeypatch.setattr(ModelStore, 'prefetch', lambda self, keys=None: calls.append(set(keys)) or prefetch(self, keys))
+    results = predict_sentiment_batch(['aplikasi bagus sekali'], models_data, models=models)
+    
+    assert results['success'].all()
+    assert set(models) <= set(results)
+    # Satu panggilan paralel untuk semua artifact yang dibutuhkan
+    assert calls[0] == expected
+    loaded = {key for key in expected | {'model_trigram', 'vectorizer_trigram'} if models_data.is_loaded(key)}
+    assert loaded == expected
@@ -0,0 +1,165 @@
+"""Kesetaraan jalur cepat preprocessing dengan jalur aslinya (regex lama, NLTK, stem live)"""
+
+import itertools
+import random
+import re
+
+import emoji
+import pytest
+
+from utils.preprocessing import StemCache, clean_text, fast_tokenize, preprocess_text
+
+
+def legacy_clean_text(text):
+    """Cleaning + casefolding versi awal: demojize lalu 13 re.sub berurutan"""
+    text = emoji.demojize(text)
+    text = re.sub(r':[a-z_]+:', ' ', text)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'http\S+|www\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'\bRT\b', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\d+', '', text)
+    text = text.lower()
+    text = re.sub(r'[^a-z\s]', ' ', text)
+    text = re.sub(r'(.)\1{2,}', r'\1\1', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+CORPUS = [
+    '',
+    '   ',
+    'Danantara bagus sekali',
+    'RT @danantara: investasi BUMN naik 25% #ekonomi',
+    'rt RT Rt rT',
+    'ART RTX sRT RT. (RT) RT_2 RT-an',
+    'kirim ke info@bumn.go.id atau admin@x.com sekarang',
+    'email@ @mention @user_123 a@b @@x',
+    '#danantara #bumn2025 #',
+    'angka 123 4.5 2025an 10k',
+    '<b>tebal</b> <br/> <a href="x">link</a> < tidak tag',
+    'cek https://t.co/abc123 dan http://x.id/a?b=1 serta www.danantara.id.',
+    'mantappp bagusss kerennnn aaaa bb ccc',
+    'HEBAT!!! SERU??? ...',
+    'tab\tbaris\nbaru\r\nnbsp em ideo　spasi',
+    'zero​width dan line',
+    'emoji 😀 di tengah 😡 dan 👍🏽 juga 🇮🇩 bendera ❤️ 1️⃣',
+    'café naïve Ünïcode ß İstanbul',
+    "tanda 'kutip' \"ganda\" dan - strip_underscore",
+    '@user#tag RT#tag http://a.b@c.d',
+]
+
+
+def test_clean_text_matches_legacy_pipeline():
+    for text in CORPUS:
+        assert clean_text(text) == legacy_clean_text(text), text
+
+
+def test_clean_text_matches_legacy_pipeline_combinations():
+    # Gabungan pasangan potongan corpus (dengan dan tanpa spasi) supaya pola saling bersinggungan
+    for first, second in itertools.product(CORPUS, repeat=2):
+        for separator in (' ', ''):
+            text = first + separator + second
+            assert clean_text(text) == legacy_clean_text(text), text
+
+
+TOKENIZE_CORPUS = [
+    'cannot',
+    'saya cannot datang',
+    'kita gonna',
+    'mereka wanna',
+    'gonna wanna cannot',
+    'gimme lemme gotta',
+    'gimme dong lemme lihat gotta go',
+    'cannotx xcannot gonnaa wannabe',
+    'aplikasi danantara bagus',
+    'aa bb cc',
+]
+
+
+def test_fast_tokenize_matches_nltk():
+    nltk = pytest.importorskip('nltk')
+    try:
+        nltk.data.find('tokenizers/punkt_tab/english/')
+    except LookupError:
+        pytest.skip("Data NLTK 'punkt_tab' tidak tersedia")
+    from nltk.tokenize import word_tokenize
+    
+    texts = TOKENIZE_CORPUS + [clean_text(text) for text in CORPUS]
+    for text in texts:
+        assert fast_tokenize(text) == word_tokenize(text), text
+
+
+@pytest.fixture(scope='module')
+def preprocessing(test_config):
+    import os
+    
+    from utils.model_loader import ModelStore
+    
+    if not os.path.exists(test_config.TOKEN_TABLE_PATH):
+        pytest.skip('Token table belum dibuat')
+    try:
+        return ModelStore(test_config)['preprocessing']
+    except Exception as e:
+        pytest.skip(f"Preprocessing tidak bisa di-load: {e}")
+
+
+def test_token_table_matches_live_path(preprocessing):
+    token_table = preprocessing['token_table']
+    assert token_table is not None, 'Token table tidak cocok dengan preprocessing_tools.joblib; buat ulang'
+    stopwords = preprocessing['combined_stopwords']
+    norm_dict = preprocessing['normalization_dict']
+    stemmer = preprocessing['stemmer']
+    
+    rng = random.Random(0)
+    tokens = (
+        sorted(norm_dict)[:20] + rng.sample(sorted(norm_dict), 20)
+        + sorted(stopwords)[:10] + rng.sample(sorted(stopwords), 10)
+        + rng.sample(sorted(token_table), 40)
+        + ['danantaraku', 'zzqx', 'investasinya', 'bumnnya', 'ok', 'ya', 'x']
+    )
+    texts = [' '.join(tokens[i:i + 8]) for i in range(0, len(tokens), 8)] + [
+        'Aplikasi DANANTARA gak bagus, yg ngurus lemot bgt!!! 😡 #bumn',
+    ]
+    for text in texts:
+        expected = preprocess_text(text, stopwords, norm_dict, stemmer)
+        assert preprocess_text(text, stopwords, norm_dict, stemmer, token_table=token_table) == expected, text
+
+
+class StubStemmer:
+    def __init__(self):
+        self.calls = []
+    
+    def stem(self, word):
+        self.calls.append(word)
+        return word.upper()
+
+
+def test_stem_cache_evicts_least_recently_used():
+    stemmer = StubStemmer()
+    cache = StemCache(stemmer, maxsize=2)
+    
+    assert [cache.stem(word) for word in ('satu', 'dua', 'satu', 'tiga')] == ['SATU', 'DUA', 'SATU', 'TIGA']
+    # 'dua' paling lama tidak dipakai saat 'tiga' masuk
+    assert list(cache._cache) == ['satu', 'tiga']
+    assert cache.stem('dua') == 'DUA'
+    assert list(cache._cache) == ['tiga', 'dua']
+    assert stemmer.calls == ['satu', 'dua', 'tiga', 'dua']
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 4, 2, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 5)
+
+
+def test_stem_cache_warm_respects_maxsize_and_skips_counters():
+    stemmer = StubStemmer()
+    cache = StemCache.from_stemmer(stemmer, maxsize=2)
+    cache.warm({'satu': 'sat', 'dua': 'du', 'tiga': 'tig'})
+    
+    assert cache.stem('satu') == 'sat'
+    assert cache.stem('tiga') == 'TIGA'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 1, 1, 2)
+    assert stemmer.calls == ['tiga']
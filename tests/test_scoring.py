@@ -0,0 +1,39 @@
+"""NBScorer harus sama dengan MultinomialNB sklearn"""
+
+import numpy as np
+
+from conftest import DOCUMENTS
+from utils.compact import CompactNB, export_pair
+from utils.scoring import NBScorer, scorer_for
+
+QUERIES = DOCUMENTS + [
+    '',
+    'bagus',
+    'buruk buruk buruk lambat',
+    'kata yang tidak ada di vocabulary',
+    'investasi bumn bagus tapi pelayanan lambat',
+]
+
+
+def assert_matches_sklearn(scorer, model, X):
+    labels, probabilities = scorer.score(X)
+    np.testing.assert_array_equal(labels, model.predict(X))
+    np.testing.assert_allclose(probabilities, model.predict_proba(X), rtol=0, atol=1e-9)
+
+
+def test_scorer_matches_sklearn(nb_pair):
+    vectorizer, model = nb_pair
+    assert_matches_sklearn(NBScorer.from_model(model), model, vectorizer.transform(QUERIES))
+
+
+def test_scorer_matches_sklearn_on_compact_model(nb_pair, tmp_path):
+    vectorizer, model = nb_pair
+    export_pair(vectorizer, model, str(tmp_path), 'test')
+    compact = CompactNB(str(tmp_path))
+    X = vectorizer.transform(QUERIES)
+    
+    scorer = scorer_for(compact)
+    assert_matches_sklearn(scorer, model, X)
+    np.testing.assert_allclose(compact.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-9)
+    # Scorer memakai array mmap apa adanya, bukan salinan per process
+    assert np.shares_memory(scorer.feature_log_prob, compact.feature_log_prob_)
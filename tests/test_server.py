@@ -0,0 +1,79 @@
+"""Validasi request di HTTP server"""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from utils.server import make_server
+
+
+@pytest.fixture(scope='module')
+def server():
+    # Request yang ditolak di validasi tidak pernah menyentuh model
+    server = make_server(models_data=None, host='127.0.0.1', port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.batcher.close()
+
+
+def post(server, path, body):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        connection.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('body', [
+    b'bukan json',
+    b'[]',
+    b'["text"]',
+    b'"text"',
+    b'123',
+    b'null',
+    b'{"text": "bagus", "model": ["word"]}',
+    b'{"text": "bagus", "model": {"word": 1}}',
+    b'{"text": "bagus", "model": null}',
+    b'{"text": "bagus", "model": "unigram"}',
+])
+@pytest.mark.parametrize('path', ['/predict', '/predict_batch'])
+def test_invalid_payload_returns_400(server, path, body):
+    status, payload = post(server, path, body)
+    assert status == 400
+    assert 'error' in payload
+
+
+def test_invalid_text_returns_400(server):
+    assert post(server, '/predict', b'{"text": 1}')[0] == 400
+    assert post(server, '/predict_batch', b'{"texts": ["a", 1]}')[0] == 400
+
+
+def test_word_only_request_never_touches_trigram(test_config):
+    from utils.model_loader import load_models
+    
+    models_data = load_models(test_config, lazy=True)
+    if not models_data['loaded']:
+        pytest.skip(f"Model tidak bisa di-load: {models_data['error']}")
+    server = make_server(models_data, host='127.0.0.1', port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, payload = post(server, '/predict', b'{"text": "aplikasi bagus sekali", "model": "word"}')
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+    
+    assert status == 200
+    assert set(payload) == {'word'}
+    assert payload['word']['success']
+    assert models_data.is_loaded('model_word')
+    assert not models_data.is_loaded('model_trigram')
+    assert not models_data.is_loaded('vectorizer_trigram')
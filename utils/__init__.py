@@ -1,6 +1,6 @@
 """Utils package"""
 
 from .preprocessing import preprocess_text
-from .model_loader import load_models, predict_sentiment
+from .model_loader import load_models, predict_sentiment, predict_sentiment_batch
 
-__all__ = ['preprocess_text', 'load_models', 'predict_sentiment']
+__all__ = ['preprocess_text', 'load_models', 'predict_sentiment', 'predict_sentiment_batch']
@@ -0,0 +1,275 @@
+"""Benchmark throughput dan latency per tahap preprocessing + kedua model
+
+Contoh:
+    python -m utils.benchmark
+    python -m utils.benchmark --batch-sizes 1 100 10000 --docs 20000 -o bench.json
+    python -m utils.benchmark --corpus data.csv --text-column review
+
+Tiap tahap diukur per batch; hasil berisi docs/sec dan latency p50/p95/p99
+(milidetik per batch) untuk setiap ukuran batch, dalam JSON supaya run
+sebelum dan sesudah optimasi bisa dibandingkan.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import emoji
+import numpy as np
+
+import config
+from .model_loader import MODEL_KEYS, load_models, predict_sentiment_batch
+from .preprocessing import TOKENIZERS, apply_token_table, clean_stripped, strip_emoji
+from .scoring import scorer_for
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+# Token tambahan supaya corpus sintetis juga melewati semua regex cleaning
+_NOISE = [
+    '😀', '😡', '👍', '🙏', '🇮🇩', '❤️', '@danantara', '@user123', '#danantara', '#indonesia',
+    'RT', '2025', '100%', 'https://t.co/abc123', 'www.danantara.id', 'info@bumn.go.id',
+    '<br>', 'mantappp', 'bagusss', '!!!', '??', '...', ',',
+]
+
+
+def generate_corpus(preprocessing, n, seed=0):
+    """Corpus sintetis berbahasa Indonesia yang reproducible (seed sama = teks sama)
+
+    Kata diambil dari kamus normalisasi (slang dan bentuk baku) dan stopword,
+    dicampur emoji, mention, hashtag, URL, angka, dan huruf berulang.
+    """
+    norm_dict = preprocessing['normalization_dict']
+    vocab = sorted(set(norm_dict) | set(norm_dict.values()) | set(preprocessing['combined_stopwords']))
+    rnd = random.Random(seed)
+    
+    corpus = []
+    for _ in range(n):
+        words = [
+            rnd.choice(_NOISE) if rnd.random() < 0.1 else rnd.choice(vocab)
+            for _ in range(rnd.randint(3, 40))
+        ]
+        text = ' '.join(words)
+        if rnd.random() < 0.2:
+            text = text.upper()
+        corpus.append(text)
+    return corpus
+
+
+def load_corpus(path, text_column=None, limit=None):
+    """Baca corpus dari file csv/jsonl/parquet (kolom teks) atau txt (satu dokumen per baris)"""
+    from .bulk import find_text_column
+    from .cli import detect_format, read_batches
+    
+    if path.endswith('.txt'):
+        with open(path, encoding='utf-8') as f:
+            texts = [line.rstrip('\n') for line in f]
+        return texts[:limit]
+    
+    texts = []
+    for df in read_batches(path, detect_format(path), config.BULK_CHUNK_SIZE):
+        column = text_column or find_text_column(df.columns)
+        if column not in df.columns:
+            raise ValueError("Corpus harus memiliki kolom 'text' atau 'review' (atau pakai --text-column)")
+        texts.extend(df[column].astype(str).tolist())
+        if limit and len(texts) >= limit:
+            break
+    return texts[:limit]
+
+
+def make_stages(models_data, tokenizer):
+    """Tahap pipeline berurutan: list (nama, input, output, fungsi batch)
+
+    ``input``/``output`` adalah nama nilai di state batch; tahap model
+    membaca 'preprocessed' dan hasilnya sendiri.
+    """
+    preprocessing = models_data['preprocessing']
+    norm_dict = preprocessing['normalization_dict']
+    stopwords = preprocessing['combined_stopwords']
+    stemmer = preprocessing['stemmer']
+    tokenize = TOKENIZERS[tokenizer]
+    
+    stages = [
+        # Pembanding: cara lama (emoji.demojize lalu regex hapus :nama:), hasilnya tidak dipakai
+        ('demojize_legacy', 'raw', 'demojized', lambda texts: [emoji.demojize(text) for text in texts]),
+        ('strip_emoji', 'raw', 'stripped', lambda texts: [strip_emoji(text) for text in texts]),
+        ('clean', 'stripped', 'clean', lambda texts: [clean_stripped(text) for text in texts]),
+        ('tokenize', 'clean', 'tokens', lambda texts: [tokenize(text) for text in texts]),
+        ('normalize', 'tokens', 'normalized',
+         lambda docs: [[norm_dict.get(word, word) for word in tokens] for tokens in docs]),
+        ('stopwords', 'normalized', 'filtered',
+         lambda docs: [[word for word in tokens if word not in stopwords and len(word) > 2] for tokens in docs]),
+        ('stem', 'filtered', 'preprocessed',
+         lambda docs: [' '.join(stemmer.stem(word) for word in tokens) for tokens in docs]),
+    ]
+    
+    # Alternatif satu lookup per token (jika models/token_table.joblib ada)
+    token_table = preprocessing.get('token_table')
+    if token_table is not None:
+        stages.append((
+            'token_table', 'tokens', 'preprocessed_table',
+            lambda docs: [
+                ' '.join(apply_token_table(tokens, token_table, stopwords, norm_dict, stemmer)) for tokens in docs
+            ]
+        ))
+    
+    for name, (model_key, vectorizer_key) in MODEL_KEYS.items():
+        vectorizer = models_data[vectorizer_key]
+        scorer = scorer_for(models_data[model_key])
+        stages.append((f'vectorize_{name}', 'preprocessed', f'features_{name}', vectorizer.transform))
+        stages.append((f'score_{name}', f'features_{name}', f'scores_{name}', scorer.score))
+    
+    stages.append((
+        'end_to_end', 'raw', 'results',
+        lambda texts: predict_sentiment_batch(texts, models_data, cache=False)
+    ))
+    return stages
+
+
+def _summary(latencies, docs):
+    latencies = np.asarray(latencies)
+    seconds = float(latencies.sum())
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    return {
+        'docs': docs,
+        'batches': len(latencies),
+        'seconds': seconds,
+        'docs_per_sec': docs / seconds if seconds > 0 else None,
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+    }
+
+
+def run_benchmark(models_data, corpus, batch_sizes, docs=None, tokenizer=None, warmup=True):
+    """Jalankan semua tahap untuk tiap ukuran batch
+
+    Untuk batch size ``b`` diproses ``max(b, docs)`` dokumen (diambil berulang
+    dari corpus), dibagi jadi batch berukuran ``b``. Return list hasil per
+    (batch_size, stage).
+    """
+    stages = make_stages(models_data, tokenizer or config.TOKENIZER)
+    docs = docs or len(corpus)
+    
+    if warmup:
+        # Isi stem cache dan cache lain supaya yang diukur kondisi steady state
+        state = {'raw': corpus}
+        for _, source, target, func in stages:
+            state[target] = func(state[source])
+    
+    results = []
+    for batch_size in batch_sizes:
+        total = max(batch_size, docs)
+        texts = [corpus[i % len(corpus)] for i in range(total)]
+        latencies = {name: [] for name, _, _, _ in stages}
+        
+        for start in range(0, total, batch_size):
+            state = {'raw': texts[start:start + batch_size]}
+            for name, source, target, func in stages:
+                t0 = time.perf_counter()
+                state[target] = func(state[source])
+                latencies[name].append(time.perf_counter() - t0)
+        
+        for name, _, _, _ in stages:
+            results.append({'batch_size': batch_size, 'stage': name, **_summary(latencies[name], total)})
+    return results
+
+
+def environment_info(tokenizer=None):
+    """Versi Python/library dan setting yang mempengaruhi performa"""
+    import sklearn
+    
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'emoji': emoji.__version__,
+        'tokenizer': tokenizer or config.TOKENIZER,
+        'model_format': config.MODEL_FORMAT,
+    }
+
+
+def format_table(results):
+    """Tabel ringkas untuk dibaca manusia"""
+    lines = [f"{'batch':>7} {'stage':<18} {'docs/sec':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"]
+    for row in results:
+        rate = f"{row['docs_per_sec']:.0f}" if row['docs_per_sec'] else '-'
+        lines.append(
+            f"{row['batch_size']:>7} {row['stage']:<18} {rate:>12} "
+            f"{row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f} {row['p99_ms']:>10.3f}"
+        )
+    return '\n'.join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.benchmark',
+        description='Benchmark docs/sec dan latency p50/p95/p99 per tahap preprocessing dan model'
+    )
+    parser.add_argument('--corpus', help='File corpus (csv/jsonl/parquet/txt); default corpus sintetis')
+    parser.add_argument('--text-column', help="Kolom teks corpus (default: 'text' atau 'review')")
+    parser.add_argument('--corpus-size', type=int, default=10000, help='Jumlah dokumen corpus (default: 10000)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed corpus sintetis')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES, help='Ukuran batch')
+    parser.add_argument('--docs', type=int, help='Dokumen per ukuran batch (default: ukuran corpus)')
+    parser.add_argument('--tokenizer', choices=list(TOKENIZERS), help='Default: config.TOKENIZER')
+    parser.add_argument('--no-warmup', action='store_true', help='Ukur juga kondisi cache dingin')
+    parser.add_argument('-o', '--output', default='-', help="File JSON hasil atau '-' untuk stdout (default)")
+    parser.add_argument('-q', '--quiet', action='store_true', help='Jangan tampilkan tabel di stderr')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    models_data = load_models(config, lazy=False)
+    if not models_data['loaded']:
+        print(f"Gagal load model: {models_data['error']}", file=sys.stderr)
+        return 1
+    
+    if args.corpus:
+        corpus = load_corpus(args.corpus, args.text_column, args.corpus_size)
+        corpus_info = {'source': args.corpus, 'docs': len(corpus)}
+    else:
+        corpus = generate_corpus(models_data['preprocessing'], args.corpus_size, args.seed)
+        corpus_info = {'source': 'synthetic', 'docs': len(corpus), 'seed': args.seed}
+    
+    if not corpus:
+        print("Corpus kosong", file=sys.stderr)
+        return 1
+    
+    results = run_benchmark(
+        models_data,
+        corpus,
+        args.batch_sizes,
+        docs=args.docs,
+        tokenizer=args.tokenizer,
+        warmup=not args.no_warmup
+    )
+    
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment_info(args.tokenizer),
+        'corpus': corpus_info,
+        'results': results,
+    }
+    
+    data = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(data)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+    
+    if not args.quiet:
+        print(format_table(results), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
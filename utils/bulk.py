@@ -0,0 +1,647 @@
+"""Bulk scoring untuk file upload (multiprocess)"""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .model_loader import load_models, merge_batch_results, predict_sentiment_batch, take_batch_results
+
+# Kolom hasil di DataFrame output: (nama model, suffix kolom)
+RESULT_MODELS = [('word', 'model1'), ('trigram', 'model2')]
+
+# Jumlah contoh baris error yang disimpan saat streaming
+MAX_ERROR_SAMPLES = 1000
+
+# Kategori kolom sentiment di DataFrame hasil
+SENTIMENT_CATEGORIES = ['Negatif', 'Positif', 'N/A']
+
+# Bin histogram confidence (%) di visualisasi: tetap supaya histogram per chunk
+# (mode streaming) bisa dijumlahkan. Dua kelas -> confidence = probabilitas
+# terbesar, selalu 50-100
+CONFIDENCE_BINS = 20
+CONFIDENCE_EDGES = np.linspace(50, 100, CONFIDENCE_BINS + 1)
+
+# Key entry ResultStore yang berisi path file hasil (dihapus saat entry dibuang)
+RESULT_FILE_KEYS = ('output_path', 'parquet_path')
+
+# Models milik worker process, di-load sekali oleh initializer
+_worker_models = None
+
+
+def config_snapshot(config):
+    """Salin setting UPPERCASE dari config supaya bisa dikirim ke worker process"""
+    return types.SimpleNamespace(
+        **{key: getattr(config, key) for key in dir(config) if key.isupper()}
+    )
+
+
+def _init_worker(config, metrics_enabled=False):
+    """Initializer worker: load model dari path di config, sekali per process"""
+    global _worker_models
+    _worker_models = load_models(config)
+    metrics.enable(metrics_enabled)
+
+
+def _score_chunk(texts, models):
+    """Score satu chunk di worker process
+
+    Return (results, snapshot metrics chunk ini atau None jika metrics mati).
+    """
+    if not _worker_models['loaded']:
+        raise RuntimeError(f"Gagal load model di worker: {_worker_models['error']}")
+    results = predict_sentiment_batch(texts, _worker_models, models)
+    
+    snapshot = None
+    if metrics.enabled:
+        snapshot = metrics.REGISTRY.snapshot()
+        metrics.REGISTRY.reset()
+    return results, snapshot
+
+
+def _chunk_result(future):
+    """Ambil hasil _score_chunk; metrics worker digabung ke registry process ini"""
+    results, snapshot = future.result()
+    if snapshot is not None:
+        metrics.REGISTRY.merge(snapshot)
+    return results
+
+
+def text_values(column):
+    """Isi kolom teks untuk scoring: array object berisi str, sel kosong jadi None
+
+    ``astype(str)`` mengubah sel kosong menjadi teks 'nan' / 'None' yang ikut
+    di-score; dengan None baris itu masuk error teks kosong di preprocess_batch.
+    Nilai non-string lain (angka) tetap di-str-kan seperti sebelumnya.
+    """
+    values = column.to_numpy(dtype=object, na_value=None)
+    return np.array(
+        [value if value is None or isinstance(value, str) else str(value) for value in values],
+        dtype=object
+    )
+
+
+def dedup_texts(texts):
+    """Faktorisasi text: return (unique_texts, codes) dengan ``unique_texts[codes] == texts``
+
+    Nilai kosong (None/NaN) tidak digabung, masing-masing tetap satu baris.
+    """
+    values = np.asarray(texts, dtype=object)
+    codes, uniques = pd.factorize(values)
+    unique_texts = list(uniques)
+    
+    missing = codes == -1
+    if missing.any():
+        codes[missing] = np.arange(len(unique_texts), len(unique_texts) + missing.sum())
+        unique_texts.extend(values[missing].tolist())
+    return unique_texts, codes
+
+
+def iter_score_chunks(chunks, config, models_data=None, models=('word', 'trigram'), workers=None):
+    """Score iterable of (item, texts), yield (item, results) sesuai urutan input
+
+    ``item`` hanya diteruskan (tidak dikirim ke worker), misalnya DataFrame
+    chunk asal. Dengan lebih dari satu worker, chunk dikirim ke process pool
+    dengan jumlah chunk in-flight terbatas supaya memory tetap datar.
+    """
+    workers = workers or config.BULK_WORKERS or os.cpu_count() or 1
+    
+    if workers == 1:
+        if models_data is None:
+            models_data = load_models(config)
+        for item, texts in chunks:
+            yield item, predict_sentiment_batch(texts, models_data, models)
+        return
+    
+    # spawn: aman dipanggil dari process yang punya banyak thread (Streamlit)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(config_snapshot(config), metrics.enabled)
+    ) as executor:
+        pending = deque()
+        for item, texts in chunks:
+            pending.append((item, executor.submit(_score_chunk, texts, models)))
+            if len(pending) >= workers * 2:
+                item, future = pending.popleft()
+                yield item, _chunk_result(future)
+        
+        while pending:
+            item, future = pending.popleft()
+            yield item, _chunk_result(future)
+
+
+class TextResults:
+    """Hasil predict_sentiment_batch per text unik, untuk dipakai ulang di run berikutnya"""
+
+    def __init__(self, texts, results):
+        self.texts = pd.Index(texts, dtype=object)
+        self.results = results
+
+    def __len__(self):
+        return len(self.texts)
+
+    def lookup(self, texts):
+        """Posisi tiap text di hasil ini (-1 jika belum pernah di-score)"""
+        # Nilai kosong (None/NaN) bisa muncul berulang; pakai kemunculan pertama
+        first = np.flatnonzero(~self.texts.duplicated())
+        positions = self.texts[first].get_indexer(pd.Index(texts, dtype=object))
+        return np.where(positions >= 0, first[positions], -1)
+
+
+def score_texts(texts, config, models_data=None, models=('word', 'trigram'),
+                workers=None, chunk_size=None, progress_callback=None, previous=None):
+    """Score banyak text, dibagi per chunk ke beberapa worker process
+
+    ``workers`` dan ``chunk_size`` default dari ``config.BULK_WORKERS`` dan
+    ``config.BULK_CHUNK_SIZE``. Jika hanya ada satu worker atau satu chunk,
+    scoring jalan di process ini memakai ``models_data``.
+
+    Return format predict_sentiment_batch (urutan sama dengan input) plus
+    key 'stats' (termasuk jumlah text unik dan dedup_ratio). Text yang sama
+    hanya di-score sekali lalu hasilnya disalin ke semua barisnya.
+    ``progress_callback(done, total)`` dipanggil tiap chunk selesai, dihitung
+    dalam text unik yang benar-benar di-score.
+
+    ``previous``: TextResults dari run sebelumnya (``results['text_results']``);
+    text yang sudah ada di sana tidak di-score ulang, jadi file yang diedit
+    sedikit hanya meng-score baris yang berubah.
+    """
+    texts = list(texts)
+    total = len(texts)
+    chunk_size = chunk_size or config.BULK_CHUNK_SIZE
+    workers = workers or config.BULK_WORKERS or os.cpu_count() or 1
+    
+    # Text duplikat (retweet, copy-paste) cukup di-score sekali
+    unique_texts, codes = dedup_texts(texts)
+    unique_total = len(unique_texts)
+    
+    # Text yang sudah di-score di run sebelumnya dipakai ulang
+    positions = previous.lookup(unique_texts) if previous is not None else np.full(unique_total, -1)
+    reused_idx = np.flatnonzero(positions >= 0)
+    missing_idx = np.flatnonzero(positions < 0)
+    missing_texts = [unique_texts[i] for i in missing_idx]
+    
+    chunks = [
+        missing_texts[start:start + chunk_size] for start in range(0, len(missing_texts), chunk_size)
+    ] or [[]]
+    workers = max(1, min(workers, len(chunks)))
+    
+    start_time = time.perf_counter()
+    done = 0
+    batches = []
+    if progress_callback:
+        progress_callback(0, len(missing_texts))
+    
+    for chunk, results in iter_score_chunks(
+        ((chunk, chunk) for chunk in chunks), config, models_data, models, workers
+    ):
+        batches.append(results)
+        done += len(chunk)
+        if progress_callback:
+            progress_callback(done, len(missing_texts))
+    
+    scored = merge_batch_results(batches)
+    if len(reused_idx):
+        # Susun ulang ke urutan unique_texts: [dipakai ulang..., baru di-score...]
+        scored = merge_batch_results([take_batch_results(previous.results, positions[reused_idx]), scored])
+        order = np.empty(unique_total, dtype=np.intp)
+        order[np.concatenate([reused_idx, missing_idx])] = np.arange(unique_total)
+        scored = take_batch_results(scored, order)
+    
+    results = take_batch_results(scored, codes)
+    results['text_results'] = TextResults(unique_texts, scored)
+    results['stats'] = {
+        'rows': total,
+        'unique': unique_total,
+        'dedup_ratio': 1 - unique_total / total if total else 0.0,
+        'reused': len(reused_idx),
+        'chunks': len(chunks),
+        'workers': workers,
+        'seconds': time.perf_counter() - start_time
+    }
+    return results
+
+
+class ResultStore:
+    """LRU hasil analisis bulk per key (hash konten file), aman dipakai antar thread
+
+    File output yang disebut di entry (RESULT_FILE_KEYS) ikut dihapus saat
+    entry dibuang dari store.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            self._entries[key] = entry
+            evicted = [old] if old is not None and old is not entry else []
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[1])
+        
+        for item in evicted:
+            for key in RESULT_FILE_KEYS:
+                path = item.get(key)
+                if path and path != entry.get(key) and os.path.exists(path):
+                    os.remove(path)
+
+
+def find_text_column(columns):
+    """Cari kolom teks: 'text' atau 'review' (None jika tidak ada)"""
+    for name in ('text', 'review'):
+        if name in columns:
+            return name
+    return None
+
+
+def _excel_frame(rows, columns, offset):
+    # openpyxl memberi None untuk sel kosong; read_excel memberi NaN (juga di kolom object)
+    frame = pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(offset, offset + len(rows)))
+    return frame.fillna(np.nan)
+
+
+def read_excel_chunks(source, chunksize):
+    """Baca sheet pertama file .xlsx per chunk (DataFrame) tanpa memuat seluruh workbook
+
+    Memakai worksheet read-only openpyxl (streaming XML), jadi memory sebanding
+    dengan ukuran chunk, bukan ukuran workbook. Baris pertama = header; sel
+    header kosong jadi 'Unnamed: <i>', sel kosong jadi NaN, dan baris kosong di
+    akhir sheet dibuang, seperti read_excel. Index chunk berlanjut seperti
+    read_csv(chunksize=...).
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f'Unnamed: {i}' if name is None else name for i, name in enumerate(header)]
+        width = len(columns)
+        
+        offset = 0
+        batch = []
+        blank_rows = 0
+        for row in rows:
+            # Baris kosong ditahan dulu: yang di akhir sheet dibuang
+            if all(value is None for value in row):
+                blank_rows += 1
+                continue
+            batch.extend([(None,) * width] * blank_rows)
+            blank_rows = 0
+            # Panjang baris read-only bisa berbeda dari header
+            batch.append(row[:width] + (None,) * (width - len(row)))
+            if len(batch) >= chunksize:
+                yield _excel_frame(batch, columns, offset)
+                offset += len(batch)
+                batch = []
+        if batch:
+            yield _excel_frame(batch, columns, offset)
+    finally:
+        workbook.close()
+
+
+def _arrow_frames(batches, chunksize):
+    """RecordBatch Arrow -> DataFrame maksimal ``chunksize`` baris, index berlanjut"""
+    offset = 0
+    for batch in batches:
+        for start in range(0, batch.num_rows, chunksize):
+            df = batch.slice(start, chunksize).to_pandas()
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            yield df
+
+
+def read_parquet_chunks(source, chunksize):
+    """Baca file Parquet per chunk (DataFrame), tipe kolom tetap dari schema file"""
+    import pyarrow.parquet as pq
+    
+    yield from _arrow_frames(pq.ParquetFile(source).iter_batches(batch_size=chunksize), chunksize)
+
+
+def read_arrow_chunks(source, chunksize):
+    """Baca Arrow IPC (format file / feather v2, atau format stream) per chunk (DataFrame)"""
+    import pyarrow as pa
+    
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        batches = pa.ipc.open_stream(source)
+    yield from _arrow_frames(batches, chunksize)
+
+
+# Reader streaming per format file upload
+STREAM_READERS = {
+    'csv': lambda source, chunksize: pd.read_csv(source, chunksize=chunksize),
+    'xlsx': read_excel_chunks,
+    'parquet': read_parquet_chunks,
+    'arrow': read_arrow_chunks,
+}
+
+# Format yang membawa schema sendiri; input csv/xlsx tipenya bisa berubah antar chunk
+TYPED_FORMATS = ('parquet', 'arrow')
+
+
+def _result_column_names():
+    return {f'{kind}_{suffix}' for _, suffix in RESULT_MODELS for kind in ('sentiment', 'confidence')}
+
+
+def _arrow_table(df, string_inputs=False):
+    """DataFrame hasil -> pyarrow Table
+
+    Kolom hasil tetap categorical (dictionary) / float32. Kolom input object
+    (nilai campuran, mis. dari Excel) jadi string; ``string_inputs`` membuat
+    semua kolom input jadi string.
+    """
+    import pyarrow as pa
+    
+    result_columns = _result_column_names()
+    df = df.copy(deep=False)
+    for name in df.columns:
+        if name in result_columns:
+            continue
+        if string_inputs or df[name].dtype == object:
+            df[name] = df[name].astype('string')
+    df.columns = [str(name) for name in df.columns]
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+class ParquetChunkWriter:
+    """Tulis DataFrame hasil per chunk sebagai row group Parquet
+
+    Schema diambil dari chunk pertama (kolom yang seluruhnya kosong jadi
+    string); chunk berikutnya di-cast ke schema itu. ``target``: path atau
+    file-like.
+    """
+
+    def __init__(self, target, string_inputs=False):
+        self.target = target
+        self.string_inputs = string_inputs
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = _arrow_table(df, self.string_inputs)
+        if self._writer is None:
+            schema = pa.schema(
+                [
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ],
+                metadata=table.schema.metadata
+            )
+            self._writer = pq.ParquetWriter(self.target, schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def frame_to_parquet(df, row_group_size):
+    """DataFrame hasil -> bytes Parquet (row group per ``row_group_size`` baris)"""
+    buffer = io.BytesIO()
+    writer = ParquetChunkWriter(buffer)
+    for start in range(0, max(len(df), 1), row_group_size):
+        writer.write(df.iloc[start:start + row_group_size])
+    writer.close()
+    return buffer.getvalue()
+
+
+def add_result_columns(df, results):
+    """Tambah kolom sentiment_modelN (categorical) / confidence_modelN (float32) ke DataFrame"""
+    for name, suffix in RESULT_MODELS:
+        if name not in results:
+            continue
+        df[f'sentiment_{suffix}'] = pd.Categorical(
+            results[name]['sentiment'], categories=SENTIMENT_CATEGORIES
+        )
+        df[f'confidence_{suffix}'] = results[name]['confidence'].astype(np.float32)
+    return df
+
+
+def aggregate_results(results):
+    """Agregat hasil predict_sentiment_batch: rows, error_count, valid, positif per model, agreement
+
+    Baris valid = baris yang berhasil di-score oleh kedua model.
+    """
+    sentiment1 = results['word']['sentiment']
+    sentiment2 = results['trigram']['sentiment']
+    valid = (sentiment1 != 'N/A') & (sentiment2 != 'N/A')
+    
+    return {
+        'rows': len(results['success']),
+        'error_count': int((~results['success']).sum()),
+        'valid': int(valid.sum()),
+        'positif_model1': int((sentiment1[valid] == 'Positif').sum()),
+        'positif_model2': int((sentiment2[valid] == 'Positif').sum()),
+        'agreement': int((sentiment1[valid] == sentiment2[valid]).sum()),
+    }
+
+
+def confidence_counts(results):
+    """suffix model -> jumlah confidence baris valid (> 0) per bin CONFIDENCE_EDGES"""
+    valid = (results['word']['sentiment'] != 'N/A') & (results['trigram']['sentiment'] != 'N/A')
+    counts = {}
+    for name, suffix in RESULT_MODELS:
+        confidence = results[name]['confidence'][valid]
+        counts[suffix] = np.histogram(confidence[confidence > 0], bins=CONFIDENCE_EDGES)[0]
+    return counts
+
+
+def confidence_hist(counts):
+    """suffix model -> (counts, edges) dari confidence_counts, atau None jika kosong"""
+    return {suffix: (values, CONFIDENCE_EDGES) if values.sum() else None for suffix, values in counts.items()}
+
+
+def summarize_results(results):
+    """Semua angka untuk metric dan chart hasil bulk, dihitung sekali
+
+    Berisi aggregate_results + results['stats'] + ``confidence_hist``:
+    suffix model -> (counts, edges) histogram confidence baris valid (> 0),
+    atau None jika kosong.
+    """
+    summary = dict(results.get('stats', {}))
+    summary.update(aggregate_results(results))
+    summary['confidence_hist'] = confidence_hist(confidence_counts(results))
+    return summary
+
+
+def score_csv_stream(source, output_path, config, models_data=None,
+                     chunksize=None, workers=None, progress_callback=None, fmt='csv',
+                     parquet_path=None):
+    """Score file besar per chunk dan tulis hasil (CSV) langsung ke ``output_path``
+
+    File dibaca per chunk dengan STREAM_READERS[fmt]; tiap chunk di-score lalu
+    di-append ke output, jadi memory puncak sebanding dengan ukuran chunk,
+    bukan ukuran file. ``parquet_path``: tulis juga tiap chunk sebagai row
+    group Parquet. ``progress_callback(rows_done)`` dipanggil per chunk.
+
+    Duplikat di dalam satu chunk hanya di-score sekali.
+
+    Return stats: rows, unique, dedup_ratio, error_count, errors (contoh baris
+    gagal), valid, positif per model, agreement, confidence_hist (dijumlahkan
+    per chunk, sama seperti summarize_results), seconds.
+    """
+    chunksize = chunksize or config.BULK_CHUNK_SIZE
+    start_time = time.perf_counter()
+    state = {'text_col': None}
+    
+    def read_chunks():
+        for chunk in STREAM_READERS[fmt](source, chunksize):
+            if state['text_col'] is None:
+                state['text_col'] = find_text_column(chunk.columns)
+                if state['text_col'] is None:
+                    raise ValueError("File harus memiliki kolom 'text' atau 'review'")
+            unique_texts, codes = dedup_texts(text_values(chunk[state['text_col']]))
+            yield (chunk, codes), unique_texts
+    
+    stats = {
+        'rows': 0,
+        'unique': 0,
+        'error_count': 0,
+        'errors': [],
+        'valid': 0,
+        'positif_model1': 0,
+        'positif_model2': 0,
+        'agreement': 0
+    }
+    counts = {suffix: np.zeros(CONFIDENCE_BINS, dtype=np.int64) for _, suffix in RESULT_MODELS}
+    
+    parquet = ParquetChunkWriter(parquet_path, fmt not in TYPED_FORMATS) if parquet_path else None
+    try:
+        with open(output_path, 'w', encoding='utf-8', newline='') as output:
+            for (chunk, codes), results in iter_score_chunks(
+                read_chunks(), config, models_data, workers=workers
+            ):
+                stats['unique'] += len(results['success'])
+                results = take_batch_results(results, codes)
+                add_result_columns(chunk, results)
+                chunk.to_csv(output, index=False, header=stats['rows'] == 0)
+                if parquet is not None:
+                    parquet.write(chunk)
+                
+                # Statistik agregat, tanpa menyimpan chunk
+                stats['errors'].extend(error_samples(
+                    text_values(chunk[state['text_col']]),
+                    chunk.index,
+                    results,
+                    MAX_ERROR_SAMPLES - len(stats['errors'])
+                ))
+                
+                for key, value in aggregate_results(results).items():
+                    stats[key] += value
+                for suffix, values in confidence_counts(results).items():
+                    counts[suffix] += values
+                
+                if progress_callback:
+                    progress_callback(stats['rows'])
+    finally:
+        # Tutup writer Parquet juga saat chunk gagal (seperti handle CSV di atas)
+        if parquet is not None:
+            parquet.close()
+    
+    stats['confidence_hist'] = confidence_hist(counts)
+    stats['dedup_ratio'] = 1 - stats['unique'] / stats['rows'] if stats['rows'] else 0.0
+    stats['seconds'] = time.perf_counter() - start_time
+    return stats
+
+
+def error_samples(texts, index, results, limit=None):
+    """Contoh baris gagal: list dict index, text (maks 100 karakter), reason"""
+    samples = []
+    for i in np.flatnonzero(~results['success'])[:limit]:
+        text = texts[i] if texts[i] is not None else ''
+        samples.append({
+            'index': index[i],
+            'text': text[:100] + '...' if len(text) > 100 else text,
+            'reason': results['error'][i]
+        })
+    return samples
+
+
+def analyze_frame(df, text_col, config, models_data=None, previous=None, progress_callback=None):
+    """Analisis bulk DataFrame in-memory, siap disimpan di ResultStore
+
+    Return (entry, text_results): entry berisi summary, errors, csv dan
+    parquet (bytes hasil); text_results untuk argumen ``previous`` run berikutnya.
+    """
+    texts = text_values(df[text_col]).tolist()
+    results = score_texts(
+        texts,
+        config,
+        models_data=models_data,
+        progress_callback=progress_callback,
+        previous=previous
+    )
+    
+    add_result_columns(df, results)
+    entry = {
+        'summary': summarize_results(results),
+        'errors': error_samples(texts, df.index, results),
+        'csv': df.to_csv(index=False).encode('utf-8'),
+        'parquet': frame_to_parquet(df, config.BULK_CHUNK_SIZE)
+    }
+    return entry, results['text_results']
+
+
+def analyze_csv_stream(source, config, models_data=None, progress_callback=None, fmt='csv'):
+    """Analisis file dengan score_csv_stream ke CSV + Parquet sementara, siap disimpan di ResultStore
+
+    ``progress_callback(rows_done, None)``: total baris tidak diketahui saat streaming.
+    """
+    paths = {}
+    for key, suffix in (('output_path', '.csv'), ('parquet_path', '.parquet')):
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            paths[key] = tmp.name
+    
+    try:
+        stats = score_csv_stream(
+            source,
+            paths['output_path'],
+            config,
+            models_data=models_data,
+            progress_callback=(lambda rows: progress_callback(rows, None)) if progress_callback else None,
+            fmt=fmt,
+            parquet_path=paths['parquet_path']
+        )
+    except Exception:
+        for path in paths.values():
+            os.remove(path)
+        raise
+    
+    return {
+        'summary': stats,
+        'errors': stats['errors'],
+        **paths
+    }
@@ -0,0 +1,179 @@
+"""Cache hasil prediksi persisten (SQLite)"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Batas parameter per query SQLite (aman untuk versi lama: 999)
+_QUERY_CHUNK = 900
+
+
+def models_fingerprint(config):
+    """Fingerprint artifact yang benar-benar dipakai (path hasil artifact_path + nama, ukuran, mtime file)
+
+    Ikut berubah jika file joblib/compact diganti, MODEL_FORMAT diubah, atau
+    MODEL_VARIANTS menunjuk ke folder lain (termasuk di luar MODELS_DIR).
+    """
+    from .model_loader import ARTIFACTS, artifact_path
+    
+    digest = hashlib.sha1()
+    for key in ARTIFACTS:
+        path = os.path.abspath(artifact_path(config, key))
+        digest.update(f'{key}={path}\n'.encode('utf-8'))
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        else:
+            files = [path] if os.path.exists(path) else []
+        for file_path in files:
+            stat = os.stat(file_path)
+            relative = os.path.relpath(file_path, path) if os.path.isdir(path) else ''
+            digest.update(f'{relative}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Cache prediksi per model di file SQLite, dengan batas jumlah entry
+
+    Key = hash(fingerprint model + nama model + teks hasil preprocessing),
+    jadi hit melewati vectorization dan scoring sama sekali. Jika fingerprint
+    artifact berbeda dari yang tersimpan, isi cache dikosongkan saat dibuka.
+    Entry yang paling lama tidak dipakai dibuang jika melebihi ``max_entries``.
+    """
+
+    def __init__(self, path, fingerprint, max_entries=1000000):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS predictions ('
+            'key BLOB PRIMARY KEY, label INTEGER, prob_negatif REAL, prob_positif REAL, last_used REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)')
+        
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                # Artifact model berubah: semua hasil lama tidak berlaku
+                self._conn.execute('DELETE FROM predictions')
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,)
+                )
+            self._conn.execute('COMMIT')
+        self._size = self._conn.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+
+    def _key(self, model, text):
+        return hashlib.blake2b(
+            f'{self.fingerprint}\0{model}\0{text}'.encode('utf-8'), digest_size=16
+        ).digest()
+
+    def get_many(self, model, texts):
+        """Return dict text -> (label, prob_negatif, prob_positif) untuk text yang ada di cache"""
+        keys = {self._key(model, text): text for text in set(texts)}
+        found = {}
+        key_list = list(keys)
+        now = time.time()
+        
+        with self._lock:
+            for start in range(0, len(key_list), _QUERY_CHUNK):
+                chunk = key_list[start:start + _QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, label, prob_negatif, prob_positif FROM predictions WHERE key IN ({placeholders})',
+                    chunk
+                ).fetchall()
+                for key, label, prob_negatif, prob_positif in rows:
+                    found[keys[key]] = (label, prob_negatif, prob_positif)
+                
+                if rows:
+                    hit_keys = [row[0] for row in rows]
+                    self._conn.execute(
+                        f"UPDATE predictions SET last_used = ? WHERE key IN ({','.join('?' * len(hit_keys))})",
+                        [now, *hit_keys]
+                    )
+            
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model, rows):
+        """Simpan iterable (text, label, prob_negatif, prob_positif)"""
+        now = time.time()
+        values = list({
+            text: (self._key(model, text), int(label), float(prob_negatif), float(prob_positif), now)
+            for text, label, prob_negatif, prob_positif in rows
+        }.values())
+        if not values:
+            return
+        
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO predictions (key, label, prob_negatif, prob_positif, last_used) '
+                'VALUES (?, ?, ?, ?, ?)',
+                values
+            )
+            self._size += len(values)
+            if self._size > self.max_entries:
+                self._evict()
+            self._conn.execute('COMMIT')
+
+    def _evict(self):
+        # Hitung ulang (INSERT OR REPLACE bisa menimpa entry lama), lalu buang
+        # sampai 90% kapasitas supaya eviction tidak terjadi di setiap put
+        self._size = self._conn.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+        excess = self._size - int(self.max_entries * 0.9)
+        if self._size > self.max_entries and excess > 0:
+            self._conn.execute(
+                'DELETE FROM predictions WHERE key IN '
+                '(SELECT key FROM predictions ORDER BY last_used LIMIT ?)',
+                (excess,)
+            )
+            self.evictions += excess
+            self._size -= excess
+
+    def stats(self):
+        """Statistik cache: hits, misses, evictions, size, hit_rate"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': self._size,
+            'max_entries': self.max_entries,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_prediction_cache(config):
+    """PredictionCache sesuai config, atau None jika cache dimatikan"""
+    if not config.PREDICTION_CACHE_PATH:
+        return None
+    return PredictionCache(
+        config.PREDICTION_CACHE_PATH,
+        models_fingerprint(config),
+        config.PREDICTION_CACHE_MAX_ENTRIES
+    )
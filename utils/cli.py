@@ -0,0 +1,196 @@
+"""Command line untuk batch scoring tanpa Streamlit
+
+Contoh:
+    python -m utils.cli data.csv -o hasil.csv
+    cat data.jsonl | python -m utils.cli - --input-format jsonl --model word
+    python -m utils.cli data.parquet -o hasil.jsonl --batch-size 5000 --workers 8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import config
+from . import metrics
+from .bulk import (
+    TYPED_FORMATS, ParquetChunkWriter, add_result_columns, dedup_texts, find_text_column, iter_score_chunks,
+    read_arrow_chunks, read_excel_chunks, read_parquet_chunks, text_values
+)
+from .model_loader import MODEL_CHOICES, load_models, take_batch_results
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+# xlsx dan arrow (IPC / feather) hanya untuk input
+INPUT_FORMATS = FORMATS + ['xlsx', 'arrow']
+EXTENSIONS = {
+    '.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl', '.parquet': 'parquet', '.xlsx': 'xlsx',
+    '.arrow': 'arrow', '.feather': 'arrow',
+}
+
+
+def detect_format(path, fmt=None):
+    """Tentukan format file dari argumen atau ekstensi (default csv)"""
+    if fmt:
+        return fmt
+    if path and path != '-':
+        return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'csv')
+    return 'csv'
+
+
+def read_batches(path, fmt, batch_size):
+    """Baca input per batch (DataFrame) dari path atau stdin ('-')"""
+    import pandas as pd
+    
+    source = sys.stdin if path == '-' else path
+    
+    if fmt == 'csv':
+        yield from pd.read_csv(source, chunksize=batch_size)
+    elif fmt == 'jsonl':
+        yield from pd.read_json(source, lines=True, chunksize=batch_size)
+    elif fmt == 'parquet':
+        # Parquet butuh file yang bisa di-seek
+        if path == '-':
+            source = io.BytesIO(sys.stdin.buffer.read())
+        yield from read_parquet_chunks(source, batch_size)
+    elif fmt == 'xlsx':
+        # xlsx (zip) juga butuh file yang bisa di-seek
+        if path == '-':
+            source = io.BytesIO(sys.stdin.buffer.read())
+        yield from read_excel_chunks(source, batch_size)
+    elif fmt == 'arrow':
+        if path == '-':
+            source = io.BytesIO(sys.stdin.buffer.read())
+        yield from read_arrow_chunks(source, batch_size)
+    else:
+        raise ValueError(f"Format input tidak dikenal: {fmt}")
+
+
+class ResultWriter:
+    """Tulis DataFrame hasil per batch ke file atau stdout
+
+    Parquet: satu row group per batch; ``string_inputs`` membuat kolom input
+    jadi string (untuk input tanpa schema seperti csv/jsonl).
+    """
+
+    def __init__(self, path, fmt, string_inputs=False):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._parquet = None
+        
+        if fmt == 'parquet':
+            if path == '-':
+                raise ValueError("Output parquet harus ke file, bukan stdout")
+            self._parquet = ParquetChunkWriter(path, string_inputs)
+            self._file = None
+        elif path == '-':
+            self._file = sys.stdout
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+
+    def write(self, df):
+        if self.fmt == 'csv':
+            df.to_csv(self._file, index=False, header=self.rows == 0)
+        elif self.fmt == 'jsonl':
+            if len(df):
+                data = df.to_json(orient='records', lines=True, force_ascii=False)
+                self._file.write(data if data.endswith('\n') else data + '\n')
+        elif self.fmt == 'parquet':
+            self._parquet.write(df)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        elif self._file is sys.stdout:
+            sys.stdout.flush()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.cli',
+        description='Batch sentiment scoring (model word-based dan/atau trigram)'
+    )
+    parser.add_argument('input', help="File input (csv/jsonl/parquet/xlsx/arrow) atau '-' untuk stdin")
+    parser.add_argument('-o', '--output', default='-', help="File output atau '-' untuk stdout (default)")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, help='Default: dari ekstensi file, stdin = csv')
+    parser.add_argument('--output-format', choices=FORMATS, help='Default: dari ekstensi file, stdout = csv')
+    parser.add_argument('--text-column', help="Kolom teks (default: 'text' atau 'review')")
+    parser.add_argument('--model', choices=list(MODEL_CHOICES), default='both', help='Model yang dipakai (default: both)')
+    parser.add_argument('--batch-size', type=int, default=config.BULK_CHUNK_SIZE, help='Baris per batch')
+    parser.add_argument('--workers', type=int, default=config.BULK_WORKERS, help='Jumlah worker process (default: semua core)')
+    parser.add_argument('--metrics', metavar='FILE', help='Catat waktu per tahap dan tulis metrics (teks Prometheus) ke FILE')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Jangan tampilkan progress di stderr')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    models = MODEL_CHOICES[args.model]
+    if args.metrics:
+        metrics.enable()
+    input_format = detect_format(args.input, args.input_format)
+    output_format = detect_format(args.output, args.output_format)
+    if output_format not in FORMATS:
+        parser.error(f"Format output tidak didukung: {output_format} (pilih {', '.join(FORMATS)})")
+    
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+    
+    # Worker process load model sendiri; di process ini hanya perlu untuk 1 worker
+    models_data = None
+    if args.workers == 1:
+        models_data = load_models(config)
+        if not models_data['loaded']:
+            log(f"Gagal load model: {models_data['error']}")
+            return 1
+    
+    state = {'text_col': args.text_column}
+    
+    def batches():
+        for df in read_batches(args.input, input_format, args.batch_size):
+            if state['text_col'] is None:
+                state['text_col'] = find_text_column(df.columns)
+            if state['text_col'] not in df.columns:
+                raise ValueError("Input harus memiliki kolom 'text' atau 'review' (atau pakai --text-column)")
+            unique_texts, codes = dedup_texts(text_values(df[state['text_col']]))
+            yield (df, codes), unique_texts
+    
+    start_time = time.perf_counter()
+    error_count = 0
+    unique_count = 0
+    writer = ResultWriter(args.output, output_format, string_inputs=input_format not in TYPED_FORMATS)
+    
+    try:
+        for (df, codes), results in iter_score_chunks(batches(), config, models_data, models, args.workers):
+            unique_count += len(results['success'])
+            results = take_batch_results(results, codes)
+            add_result_columns(df, results)
+            writer.write(df)
+            error_count += int((~results['success']).sum())
+            log(f"{writer.rows} baris selesai")
+    except (ValueError, OSError, RuntimeError) as e:
+        log(f"Error: {e}")
+        return 1
+    finally:
+        writer.close()
+    
+    seconds = time.perf_counter() - start_time
+    rate = writer.rows / seconds if seconds > 0 else 0.0
+    dedup_ratio = 1 - unique_count / writer.rows if writer.rows else 0.0
+    log(f"Selesai: {writer.rows} baris, {error_count} gagal, {seconds:.1f} detik ({rate:.0f} baris/detik)")
+    log(f"Duplikat: {dedup_ratio * 100:.1f}% ({unique_count} teks unik di-score)")
+    if args.metrics:
+        metrics.dump(args.metrics)
+        for stage, summary in metrics.REGISTRY.stage_summary().items():
+            log(f"  {stage}: {summary['seconds']:.2f} detik ({summary['mean_ms']:.3f} ms x {summary['count']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
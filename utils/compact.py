@@ -0,0 +1,225 @@
+"""Format artifact model yang ringkas dan bisa di-memory-map
+
+Vectorizer TF-IDF dan model Naive Bayes disimpan sebagai file .npy per
+model (idf, vocabulary terurut, feature_log_prob, class_log_prior). Saat
+di-load dengan ``mmap_mode='r'`` halaman memory dibagi antar process, jadi
+N worker tidak lagi memegang N salinan vocabulary dan koefisien.
+
+Export dari joblib: python -m utils.compact [--output models/compact]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import logsumexp
+from sklearn.preprocessing import normalize
+
+from .model_loader import ARTIFACTS, MODEL_KEYS
+from .scoring import joint_log_likelihood
+
+FORMAT_VERSION = 1
+
+
+def export_compact(models_data, output_dir):
+    """Export vectorizer + model NB tiap model ke ``output_dir/<nama model>/``"""
+    for name, (model_key, vectorizer_key) in MODEL_KEYS.items():
+        export_pair(
+            models_data[vectorizer_key],
+            models_data[model_key],
+            os.path.join(output_dir, name),
+            name
+        )
+
+
+def export_pair(vectorizer, model, directory, name='model', keep=None):
+    """Export satu pasangan TfidfVectorizer + MultinomialNB ke ``directory``
+
+    ``keep``: index kolom fitur yang dipertahankan (untuk varian pruned);
+    default semua kolom.
+    """
+    params = vectorizer.get_params()
+    if (params['analyzer'] != 'word' or params['preprocessor'] is not None
+            or params['tokenizer'] is not None or params['stop_words'] is not None
+            or params['strip_accents'] is not None or params['sublinear_tf']
+            or params['binary'] or not params['use_idf']):
+        raise ValueError(f"Vectorizer '{name}' memakai opsi yang tidak didukung format compact")
+    
+    vocabulary = vectorizer.vocabulary_
+    idf = vectorizer.idf_
+    feature_log_prob = model.feature_log_prob_
+    if keep is not None:
+        # Nomori ulang kolom yang dipertahankan: 0..len(keep)-1, urutan kolom asal
+        keep = np.sort(np.asarray(keep))
+        new_columns = np.full(len(idf), -1)
+        new_columns[keep] = np.arange(len(keep))
+        vocabulary = {
+            term: int(new_columns[column]) for term, column in vocabulary.items()
+            if new_columns[column] >= 0
+        }
+        idf = idf[keep]
+        feature_log_prob = feature_log_prob[:, keep]
+    
+    os.makedirs(directory, exist_ok=True)
+    
+    # Vocabulary sebagai array string terurut + index kolom -> lookup via searchsorted
+    terms = np.array(sorted(vocabulary))
+    columns = np.array([vocabulary[term] for term in terms], dtype=np.int32)
+    
+    arrays = {
+        'vocab_terms': terms,
+        'vocab_columns': columns,
+        'idf': idf,
+        'feature_log_prob': feature_log_prob,
+        'class_log_prior': model.class_log_prior_,
+        'classes': model.classes_,
+    }
+    for key, array in arrays.items():
+        np.save(os.path.join(directory, f'{key}.npy'), np.ascontiguousarray(array))
+    
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'ngram_range': list(params['ngram_range']),
+        'lowercase': params['lowercase'],
+        'token_pattern': params['token_pattern'],
+        'norm': params['norm'],
+    }
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+def _load_arrays(directory, names, mmap_mode):
+    return {
+        name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+        for name in names
+    }
+
+
+class CompactVectorizer:
+    """Pengganti TfidfVectorizer (hanya transform) dari artifact compact
+
+    Hasil ``transform`` sama dengan TfidfVectorizer asal: struktur sparse
+    identik, nilai berbeda paling banyak pembulatan floating point (urutan
+    penjumlahan saat normalisasi).
+    """
+
+    def __init__(self, directory, mmap_mode='r'):
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Versi format compact tidak didukung: {meta['format_version']}")
+        
+        arrays = _load_arrays(directory, ['vocab_terms', 'vocab_columns', 'idf'], mmap_mode)
+        self.vocab_terms = arrays['vocab_terms']
+        self.vocab_columns = arrays['vocab_columns']
+        self.idf_ = arrays['idf']
+        self.ngram_range = tuple(meta['ngram_range'])
+        self.lowercase = meta['lowercase']
+        self.norm = meta['norm']
+        self._token_re = re.compile(meta['token_pattern'])
+
+    def analyze(self, doc):
+        """Token + n-gram, sama dengan analyzer 'word' sklearn"""
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = self._token_re.findall(doc)
+        
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                ngrams.append(' '.join(tokens[i:i + n]))
+        return ngrams
+
+    def lookup(self, terms):
+        """Index kolom untuk tiap term (-1 jika tidak ada di vocabulary)"""
+        if len(terms) == 0:
+            return np.zeros(0, dtype=np.int64)
+        # Cast ke dtype vocabulary memotong term yang lebih panjang; term
+        # seperti itu pasti tidak ada di vocabulary
+        width = self.vocab_terms.dtype.itemsize // 4
+        too_long = np.fromiter((len(term) > width for term in terms), dtype=bool, count=len(terms))
+        terms = np.asarray(terms, dtype=self.vocab_terms.dtype)
+        
+        position = np.searchsorted(self.vocab_terms, terms)
+        position = np.minimum(position, len(self.vocab_terms) - 1)
+        found = (self.vocab_terms[position] == terms) & ~too_long
+        return np.where(found, self.vocab_columns[position], -1)
+
+    def count_matrix(self, documents_terms):
+        """CSR matrix jumlah kemunculan dari list of list term"""
+        lengths = [len(terms) for terms in documents_terms]
+        flat = [term for terms in documents_terms for term in terms]
+        
+        columns = self.lookup(flat)
+        rows = np.repeat(np.arange(len(documents_terms)), lengths)
+        keep = columns >= 0
+        
+        counts = sp.csr_matrix(
+            (np.ones(int(keep.sum())), (rows[keep], columns[keep])),
+            shape=(len(documents_terms), len(self.idf_))
+        )
+        counts.sum_duplicates()
+        return counts
+
+    def tfidf(self, counts):
+        """Bobot TF-IDF + normalisasi, sama dengan TfidfTransformer.transform"""
+        counts.data *= self.idf_[counts.indices]
+        if self.norm is not None:
+            counts = normalize(counts, norm=self.norm, copy=False)
+        return counts
+
+    def transform(self, raw_documents):
+        return self.tfidf(self.count_matrix([self.analyze(doc) for doc in raw_documents]))
+
+
+class CompactNB:
+    """Pengganti MultinomialNB (hanya predict/predict_proba) dari artifact compact"""
+
+    def __init__(self, directory, mmap_mode='r'):
+        arrays = _load_arrays(directory, ['feature_log_prob', 'class_log_prior', 'classes'], mmap_mode)
+        self.feature_log_prob_ = arrays['feature_log_prob']
+        self.class_log_prior_ = arrays['class_log_prior']
+        self.classes_ = np.asarray(arrays['classes'])
+
+    def _joint_log_likelihood(self, X):
+        return joint_log_likelihood(X, self.feature_log_prob_, self.class_log_prior_)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self._joint_log_likelihood(X), axis=1)]
+
+    def predict_log_proba(self, X):
+        jll = self._joint_log_likelihood(X)
+        return jll - np.atleast_2d(logsumexp(jll, axis=1)).T
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+
+def main(argv=None):
+    import config
+    
+    parser = argparse.ArgumentParser(prog='python -m utils.compact', description='Export model joblib ke format compact')
+    parser.add_argument('--output', default=config.COMPACT_DIR, help='Folder output (default: config.COMPACT_DIR)')
+    args = parser.parse_args(argv)
+    
+    # Selalu dari file joblib, apa pun MODEL_FORMAT di config
+    models_data = {
+        key: joblib.load(getattr(config, ARTIFACTS[key]))
+        for keys in MODEL_KEYS.values() for key in keys
+    }
+    export_compact(models_data, args.output)
+    print(f"Model compact ditulis ke {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
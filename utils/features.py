@@ -0,0 +1,139 @@
+"""Feature extraction gabungan untuk model word-based dan trigram"""
+
+import re
+import weakref
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+# Parameter analyzer per vectorizer (di-cache, get_params cukup mahal)
+_analysis_params = weakref.WeakKeyDictionary()
+# Matrix diagonal idf_ per vectorizer (TfidfVectorizer)
+_idf_diags = weakref.WeakKeyDictionary()
+
+
+def analysis_params(vectorizer):
+    """(lowercase, token_pattern, ngram_range) atau None jika tidak bisa di-fuse
+
+    None jika analyzer tidak standar, atau bobot TF-IDF tidak tersedia lewat
+    atribut publik (``idf_``, ``norm``, ``sublinear_tf``); vectorizer seperti
+    itu di-transform terpisah.
+    """
+    params = _analysis_params.get(vectorizer)
+    if params is None:
+        if hasattr(vectorizer, 'lookup'):
+            # CompactVectorizer
+            params = (vectorizer.lowercase, vectorizer._token_re.pattern, vectorizer.ngram_range)
+        else:
+            p = vectorizer.get_params()
+            standard = (
+                p['analyzer'] == 'word' and p['preprocessor'] is None and p['tokenizer'] is None
+                and p['stop_words'] is None and p['strip_accents'] is None and not p['binary']
+            )
+            params = (p['lowercase'], p['token_pattern'], tuple(p['ngram_range'])) if standard else False
+            try:
+                if p['use_idf']:
+                    vectorizer.idf_
+                vectorizer.norm, vectorizer.sublinear_tf
+            except AttributeError:
+                params = False
+        _analysis_params[vectorizer] = params
+    return params or None
+
+
+class FusedVectorizer:
+    """Tokenisasi sekali, isi sparse row untuk beberapa vectorizer sekaligus
+
+    Token dan n-gram (unigram/bigram/trigram) dibuat satu kali per dokumen
+    lalu dipetakan ke vocabulary tiap vectorizer. Hasil ``transform``
+    identik dengan memanggil ``vectorizer.transform`` masing-masing.
+    Vectorizer dengan analyzer berbeda otomatis di-transform terpisah.
+    """
+
+    def __init__(self, vectorizers):
+        self.vectorizers = dict(vectorizers)
+        self.fused = {}
+        self.separate = {}
+        
+        shared = None
+        for name, vectorizer in self.vectorizers.items():
+            params = analysis_params(vectorizer)
+            if params is not None and (shared is None or params[:2] == shared):
+                shared = params[:2]
+                self.fused[name] = params[2]
+            else:
+                self.separate[name] = vectorizer
+        
+        if shared is not None:
+            self.lowercase, token_pattern = shared
+            self._token_re = re.compile(token_pattern)
+            self.max_n = max(max_n for _, max_n in self.fused.values())
+
+    def _grams(self, doc):
+        """List n-gram per n (index 1..max_n) untuk satu dokumen"""
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = self._token_re.findall(doc)
+        
+        grams = [None, tokens]
+        for n in range(2, self.max_n + 1):
+            grams.append([' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)])
+        return grams
+
+    def _tfidf(self, vectorizer, documents_terms):
+        if hasattr(vectorizer, 'lookup'):
+            return vectorizer.tfidf(vectorizer.count_matrix(documents_terms))
+        
+        # Matrix count sama persis dengan CountVectorizer._count_vocab (index terurut)
+        vocabulary = vectorizer.vocabulary_
+        indices = []
+        indptr = [0]
+        for terms in documents_terms:
+            indices.extend(vocabulary[term] for term in terms if term in vocabulary)
+            indptr.append(len(indices))
+        
+        counts = sp.csr_matrix(
+            (np.ones(len(indices), dtype=vectorizer.dtype), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(documents_terms), len(vocabulary))
+        )
+        counts.sum_duplicates()
+        
+        # Sama dengan TfidfTransformer.transform, lewat atribut publik vectorizer
+        if counts.dtype.kind != 'f':
+            counts = counts.astype(np.float64)
+        if vectorizer.sublinear_tf:
+            np.log(counts.data, counts.data)
+            counts.data += 1
+        if vectorizer.use_idf:
+            # Perkalian dengan matrix diagonal (bukan data *= idf) supaya urutan
+            # index, jadi juga hasil penjumlahan saat scoring, persis sama
+            idf_diag = _idf_diags.get(vectorizer)
+            if idf_diag is None:
+                idf = vectorizer.idf_
+                idf_diag = _idf_diags[vectorizer] = sp.diags(
+                    idf, offsets=0, shape=(len(idf), len(idf)), format='csr', dtype=counts.dtype
+                )
+            counts = counts @ idf_diag
+        if vectorizer.norm is not None:
+            counts = normalize(counts, norm=vectorizer.norm, copy=False)
+        return counts
+
+    def transform(self, raw_documents):
+        """Return dict nama -> sparse matrix TF-IDF"""
+        raw_documents = list(raw_documents)
+        features = {}
+        
+        if self.fused:
+            all_grams = [self._grams(doc) for doc in raw_documents]
+            for name, (min_n, max_n) in self.fused.items():
+                documents_terms = [
+                    [term for n in range(min_n, max_n + 1) for term in grams[n]]
+                    for grams in all_grams
+                ]
+                features[name] = self._tfidf(self.vectorizers[name], documents_terms)
+        
+        for name, vectorizer in self.separate.items():
+            features[name] = vectorizer.transform(raw_documents)
+        
+        return features
@@ -0,0 +1,104 @@
+"""Job runner background untuk analisis bulk"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """Satu baris di tabel job: status, progress, dan hasil
+
+    Status: 'queued' -> 'running' -> 'done' / 'failed'. Progress hanya
+    disimpan di object ini (tanpa update UI), UI membacanya saat polling.
+    """
+
+    def __init__(self, name, key=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.key = key
+        self.status = 'queued'
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def progress(self, done, total=None):
+        """Dipakai sebagai progress_callback fungsi scoring"""
+        self.done = done
+        self.total = total
+
+    @property
+    def fraction(self):
+        """Progress 0..1 (None jika total tidak diketahui)"""
+        if self.status == 'done':
+            return 1.0
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def seconds(self):
+        """Lama job berjalan sejauh ini / total"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobRunner:
+    """Thread pool + tabel job; hasil tetap ada walaupun session yang submit sudah ditutup
+
+    Hanya ``history`` job terakhir yang sudah selesai disimpan.
+    """
+
+    def __init__(self, max_workers=1, history=50):
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bulk-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name, func, *args, key=None, **kwargs):
+        """Jalankan ``func(*args, progress_callback=job.progress, **kwargs)`` di background"""
+        job = Job(name, key)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.status = 'running'
+        job.started = time.time()
+        try:
+            job.result = func(*args, progress_callback=job.progress, **kwargs)
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished = time.time()
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Job berdasarkan ID (None jika tidak ada / sudah dibuang)"""
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id.strip())
+
+    def jobs(self):
+        """Semua job di tabel, terbaru dulu"""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
@@ -0,0 +1,205 @@
+"""Metrics opsional (counter + histogram) untuk profiling per tahap
+
+Default mati. Call site memeriksa ``metrics.enabled`` dulu, jadi saat mati
+overhead-nya hanya satu pengecekan atribut. Hasil bisa di-render sebagai
+teks Prometheus (endpoint /metrics server) atau ditulis ke file.
+"""
+
+import os
+import threading
+import weakref
+
+enabled = False
+
+# Bucket histogram (batas atas, Prometheus-style)
+SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Deskripsi metric untuk baris # HELP
+HELP = {
+    'sentiment_stage_seconds': 'Waktu per tahap preprocessing / model (detik)',
+    'sentiment_documents_total': 'Jumlah dokumen yang diproses',
+    'sentiment_errors_total': 'Jumlah dokumen gagal (kosong setelah preprocessing / error)',
+    'sentiment_tokens': 'Jumlah token per dokumen setelah stopword removal',
+    'sentiment_tokens_total': 'Jumlah token yang di-stem',
+    'sentiment_stem_cache': 'Statistik stem cache per ModelStore (hits, misses, evictions, size, hit_rate)',
+    'sentiment_prediction_cache': 'Statistik cache prediksi per ModelStore (hits, misses, evictions, size, hit_rate)',
+}
+
+
+class Registry:
+    """Kumpulan counter dan histogram, thread-safe
+
+    Key metric = (nama, label terurut). ``snapshot``/``merge`` dipakai untuk
+    menggabungkan metric dari worker process ke process utama.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': buckets,
+                    'counts': [0] * len(buckets),
+                    'sum': 0.0,
+                    'count': 0
+                }
+            for i, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def add_collector(self, method):
+        """Daftarkan method yang return list (nama, labels, nilai) gauge saat render
+
+        Disimpan sebagai weak reference, jadi tidak menahan object pemiliknya.
+        """
+        with self._lock:
+            self._collectors.append(weakref.WeakMethod(method))
+
+    def _gauges(self):
+        gauges = []
+        with self._lock:
+            self._collectors = [ref for ref in self._collectors if ref() is not None]
+            collectors = [ref() for ref in self._collectors]
+        for collector in collectors:
+            if collector is not None:
+                gauges.extend(collector())
+        return gauges
+
+    def snapshot(self):
+        """Salinan isi registry (picklable)"""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {
+                    key: {**value, 'counts': list(value['counts'])}
+                    for key, value in self._histograms.items()
+                }
+            }
+
+    def merge(self, snapshot):
+        """Tambahkan isi snapshot (mis. dari worker process) ke registry ini"""
+        with self._lock:
+            for key, value in snapshot['counters'].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, value in snapshot['histograms'].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    self._histograms[key] = {**value, 'counts': list(value['counts'])}
+                    continue
+                histogram['counts'] = [a + b for a, b in zip(histogram['counts'], value['counts'])]
+                histogram['sum'] += value['sum']
+                histogram['count'] += value['count']
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def stage_summary(self, since=None):
+        """Ringkasan sentiment_stage_seconds per stage: count, seconds, mean_ms
+
+        ``since``: snapshot sebelumnya, hasilnya selisih (mis. untuk satu run bulk).
+        """
+        current = self.snapshot()['histograms']
+        previous = since['histograms'] if since else {}
+        summary = {}
+        for key, value in current.items():
+            name, labels = key
+            if name != 'sentiment_stage_seconds':
+                continue
+            before = previous.get(key, {'count': 0, 'sum': 0.0})
+            count = value['count'] - before['count']
+            seconds = value['sum'] - before['sum']
+            if count:
+                summary[dict(labels)['stage']] = {
+                    'count': count,
+                    'seconds': seconds,
+                    'mean_ms': seconds / count * 1000
+                }
+        return summary
+
+    def render(self):
+        """Semua metric dalam format teks Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in HELP:
+                    lines.append(f'# HELP {name} {HELP[name]}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(snapshot['counters'].items()):
+            header(name, 'counter')
+            lines.append(f'{name}{_labels(labels)} {value}')
+
+        for (name, labels), histogram in sorted(snapshot['histograms'].items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(histogram['buckets'], histogram['counts']):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels + (("le", _number(bound)),))} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+            lines.append(f'{name}_sum{_labels(labels)} {histogram["sum"]}')
+            lines.append(f'{name}_count{_labels(labels)} {histogram["count"]}')
+
+        gauges = [(name, tuple(sorted(labels.items())), value) for name, labels, value in self._gauges()]
+        for name, labels, value in sorted(gauges, key=lambda gauge: gauge[:2]):
+            header(name, 'gauge')
+            lines.append(f'{name}{_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+REGISTRY = Registry()
+
+
+def enable(flag=True):
+    """Nyalakan / matikan pencatatan metric di process ini"""
+    global enabled
+    enabled = flag
+
+
+def observe_stage(stage, seconds):
+    REGISTRY.observe('sentiment_stage_seconds', seconds, stage=stage)
+
+
+def dump(path):
+    """Tulis metric (teks Prometheus) ke file, mis. untuk node_exporter textfile collector"""
+    data = REGISTRY.render()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -1,48 +1,305 @@
 """Load models dan predict"""
 
-import joblib
-from .preprocessing import preprocess_text
+import itertools
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
+from . import metrics
+from .cache import open_prediction_cache
+from .preprocessing import StemCache, configure_nltk, preprocess_text
 
-def load_models(config):
-    """Load semua model dan preprocessing tools"""
-    try:
-        preprocessing = joblib.load(config.PREPROCESSING_PATH)
-        model_word = joblib.load(config.MODEL_WORD_PATH)
-        vectorizer_word = joblib.load(config.VECTORIZER_WORD_PATH)
-        model_trigram = joblib.load(config.MODEL_TRIGRAM_PATH)
-        vectorizer_trigram = joblib.load(config.VECTORIZER_TRIGRAM_PATH)
+
+# Pasangan key (model, vectorizer) di models_data untuk tiap model
+MODEL_KEYS = {
+    'word': ('model_word', 'vectorizer_word'),
+    'trigram': ('model_trigram', 'vectorizer_trigram'),
+}
+
+# Pilihan model untuk CLI / server
+MODEL_CHOICES = {
+    'word': ('word',),
+    'trigram': ('trigram',),
+    'both': ('word', 'trigram'),
+}
+
+
+# Artifact di models_data -> nama setting path di config
+ARTIFACTS = {
+    'preprocessing': 'PREPROCESSING_PATH',
+    'model_word': 'MODEL_WORD_PATH',
+    'vectorizer_word': 'VECTORIZER_WORD_PATH',
+    'model_trigram': 'MODEL_TRIGRAM_PATH',
+    'vectorizer_trigram': 'VECTORIZER_TRIGRAM_PATH',
+}
+
+
+def artifact_path(config, key):
+    """Path artifact sesuai config
+
+    Urutan: varian per model di ``config.MODEL_VARIANTS`` (folder compact,
+    mis. hasil python -m utils.prune), lalu ``MODEL_FORMAT`` ('joblib' atau
+    folder 'compact').
+    """
+    if key != 'preprocessing':
+        name = next(name for name, keys in MODEL_KEYS.items() if key in keys)
+        variant = getattr(config, 'MODEL_VARIANTS', {}).get(name)
+        if variant:
+            return variant
+        if config.MODEL_FORMAT == 'compact':
+            return os.path.join(config.COMPACT_DIR, name)
+    return getattr(config, ARTIFACTS[key])
+
+
+def _path_size(path):
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+def deep_sizeof(obj):
+    """Perkiraan memory (bytes) sebuah object beserta isinya"""
+    import numpy as np
+    
+    seen = set()
+    stack = [obj]
+    total = 0
+    
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
         
-        return {
-            'preprocessing': preprocessing,
-            'model_word': model_word,
-            'vectorizer_word': vectorizer_word,
-            'model_trigram': model_trigram,
-            'vectorizer_trigram': vectorizer_trigram,
-            'loaded': True
+        if isinstance(item, np.ndarray):
+            total += sys.getsizeof(item) if item.base is None else item.nbytes
+            continue
+        
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__') and not isinstance(item, type):
+            stack.append(item.__dict__)
+    
+    return total
+
+
+def _prepare_preprocessing(preprocessing, config):
+    """Pasang stem cache, tokenizer (+ setting data NLTK), dan token table dari config ke preprocessing tools"""
+    preprocessing['stemmer'] = StemCache.from_stemmer(
+        preprocessing['stemmer'],
+        config.STEM_CACHE_SIZE
+    )
+    preprocessing['tokenizer'] = config.TOKENIZER
+    configure_nltk(getattr(config, 'NLTK_DATA_DIR', None), getattr(config, 'OFFLINE', False))
+    
+    from .token_table import load_token_table
+    
+    # Opsional: tanpa file (atau jika tidak cocok) preprocessing memakai jalur live
+    preprocessing['token_table'] = load_token_table(
+        getattr(config, 'TOKEN_TABLE_PATH', None),
+        config.PREPROCESSING_PATH
+    )
+    return preprocessing
+
+
+# Label 'store' gauge cache: tiap ModelStore di process ini punya series sendiri
+_store_ids = itertools.count(1)
+
+
+class ModelStore(Mapping):
+    """models_data yang me-load tiap artifact saat pertama kali diakses
+
+    Dipakai seperti dict hasil load_models lama (``models_data['model_word']``,
+    ``models_data['loaded']``). Request word-based tidak pernah menyentuh file
+    trigram. ``timings`` berisi waktu load dan memory per artifact.
+
+    Akses langsung me-load satu artifact; artifact lain tidak ikut di-load di
+    background (itu yang membuat request word-only hemat). Pemakai yang butuh
+    beberapa artifact sekaligus memanggil prefetch_models dulu, sehingga
+    artifact yang belum ada di-load paralel.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.timings = {}
+        self._artifacts = {}
+        self._locks = {key: threading.Lock() for key in ARTIFACTS}
+        self._cache_lock = threading.Lock()
+        self._prediction_cache = None
+        self._store_id = str(next(_store_ids))
+        metrics.REGISTRY.add_collector(self._metric_gauges)
+
+    def __getitem__(self, key):
+        if key == 'loaded':
+            return True
+        if key not in ARTIFACTS:
+            raise KeyError(key)
+        
+        if key not in self._artifacts:
+            with self._locks[key]:
+                if key not in self._artifacts:
+                    self._artifacts[key] = self._load(key)
+        return self._artifacts[key]
+
+    def __iter__(self):
+        return iter(['loaded', *ARTIFACTS])
+
+    def __len__(self):
+        return len(ARTIFACTS) + 1
+
+    def _load(self, key):
+        path = artifact_path(self.config, key)
+        start = time.perf_counter()
+        
+        if os.path.isdir(path):
+            # Format compact: array di-memory-map, dibagi antar process
+            from .compact import CompactNB, CompactVectorizer
+            
+            artifact = CompactVectorizer(path) if key.startswith('vectorizer') else CompactNB(path)
+        else:
+            import joblib
+            
+            artifact = joblib.load(path)
+        if key == 'preprocessing':
+            artifact = _prepare_preprocessing(artifact, self.config)
+        
+        self.timings[key] = {
+            'path': path,
+            'seconds': time.perf_counter() - start,
+            'file_bytes': _path_size(path),
+            'memory_bytes': deep_sizeof(artifact)
         }
+        return artifact
+
+    @property
+    def prediction_cache(self):
+        """PredictionCache dari config (dibuka saat pertama dipakai), atau None"""
+        if self._prediction_cache is None and getattr(self.config, 'PREDICTION_CACHE_PATH', None):
+            with self._cache_lock:
+                if self._prediction_cache is None:
+                    self._prediction_cache = open_prediction_cache(self.config)
+        return self._prediction_cache
+
+    def _metric_gauges(self):
+        """Statistik stem cache dan cache prediksi untuk metrics (tanpa memicu load)"""
+        gauges = []
+        if self.is_loaded('preprocessing'):
+            stemmer = self._artifacts['preprocessing']['stemmer']
+            if hasattr(stemmer, 'stats'):
+                gauges.extend(
+                    ('sentiment_stem_cache', {'store': self._store_id, 'stat': key}, value)
+                    for key, value in stemmer.stats().items()
+                )
+        if self._prediction_cache is not None:
+            gauges.extend(
+                ('sentiment_prediction_cache', {'store': self._store_id, 'stat': key}, value)
+                for key, value in self._prediction_cache.stats().items()
+            )
+        return gauges
+
+    def is_loaded(self, key):
+        return key in self._artifacts
+
+    def prefetch(self, keys=None):
+        """Load beberapa artifact sekaligus secara paralel (thread)"""
+        keys = [key for key in (keys or ARTIFACTS) if key not in self._artifacts]
+        if not keys:
+            return
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            # list() supaya exception dari thread ikut naik
+            list(executor.map(self.__getitem__, keys))
+
+
+def load_models(config, lazy=None):
+    """Load semua model dan preprocessing tools
+
+    ``lazy`` (default ``config.LAZY_LOAD``): jika True, artifact baru di-load
+    saat pertama dipakai (paralel per pemakaian, lihat prefetch_models); jika
+    False, semua artifact di-load paralel sekarang.
+    """
+    if lazy is None:
+        lazy = config.LAZY_LOAD
+    
+    try:
+        missing = [
+            artifact_path(config, key) for key in ARTIFACTS
+            if not os.path.exists(artifact_path(config, key))
+        ]
+        if missing:
+            raise FileNotFoundError(f"File model tidak ditemukan: {', '.join(missing)}")
+        
+        models_data = ModelStore(config)
+        if not lazy:
+            models_data.prefetch()
+        return models_data
     except Exception as e:
         return {'loaded': False, 'error': str(e)}
 
 
-def predict_sentiment(text, model, vectorizer, preprocessing):
-    """Predict sentiment dari text"""
+def prefetch_models(models_data, models=('word', 'trigram')):
+    """Load paralel artifact yang dibutuhkan ``models`` (+ preprocessing) yang belum di-load
+
+    Hanya untuk ModelStore; dict hasil load biasa diabaikan.
+    """
+    prefetch = getattr(models_data, 'prefetch', None)
+    if prefetch is not None:
+        prefetch(['preprocessing', *(key for name in models for key in MODEL_KEYS[name])])
+
+
+def predict_sentiment(text, model, vectorizer, preprocessing, cache=None, model_name=None):
+    """Predict sentiment dari text
+
+    Jika ``cache`` (PredictionCache) dan ``model_name`` diberikan, hasil diambil
+    dari cache tanpa vectorize/score bila teks hasil preprocessing sudah pernah dihitung.
+    """
+    import numpy as np
+    from .scoring import scorer_for
+    
     try:
         # Preprocessing
         preprocessed = preprocess_text(
             text,
             preprocessing['combined_stopwords'],
             preprocessing['normalization_dict'],
-            preprocessing['stemmer']
+            preprocessing['stemmer'],
+            preprocessing.get('tokenizer', 'fast'),
+            preprocessing.get('token_table')
         )
         
+        if metrics.enabled:
+            metrics.REGISTRY.inc('sentiment_documents_total')
+        
         if not preprocessed:
+            if metrics.enabled:
+                metrics.REGISTRY.inc('sentiment_errors_total')
             return {'success': False, 'error': 'Text kosong setelah preprocessing'}
         
-        # Transform dan predict
-        features = vectorizer.transform([preprocessed])
-        prediction = int(model.predict(features)[0])  # Convert ke int
-        probabilities = model.predict_proba(features)[0]
+        use_cache = cache is not None and model_name is not None
+        cached = cache.get_many(model_name, [preprocessed]).get(preprocessed) if use_cache else None
+        
+        if cached is not None:
+            prediction, prob_negatif, prob_positif = cached
+            probabilities = np.array([prob_negatif, prob_positif])
+        else:
+            # Transform dan predict
+            start = time.perf_counter()
+            features = vectorizer.transform([preprocessed])
+            vectorized = time.perf_counter()
+            labels, probabilities = scorer_for(model).score(features)
+            if metrics.enabled:
+                metrics.observe_stage('vectorize', vectorized - start)
+                metrics.observe_stage('score', time.perf_counter() - vectorized)
+            prediction = int(labels[0])  # Convert ke int
+            probabilities = probabilities[0]
+            if use_cache:
+                cache.put_many(model_name, [(preprocessed, prediction, probabilities[0], probabilities[1])])
         
         sentiment = "Positif" if prediction == 1 else "Negatif"
         confidence = float(probabilities[prediction] * 100)  # Convert ke float
@@ -57,3 +314,237 @@ def predict_sentiment(text, model, vectorizer, preprocessing):
         }
     except Exception as e:
         return {'success': False, 'error': str(e)}
+
+
+def preprocess_batch(texts, preprocessing):
+    """Preprocess banyak text, masing-masing tepat satu kali
+
+    Return (preprocessed, errors): dua list sepanjang ``texts``. Error berisi
+    None untuk text yang berhasil.
+    """
+    preprocessed = []
+    errors = []
+    
+    for text in texts:
+        # Skip teks kosong atau terlalu pendek
+        if text is None or len(str(text).strip()) < 1:
+            preprocessed.append('')
+            errors.append('Teks kosong atau terlalu pendek')
+            continue
+        
+        try:
+            result = preprocess_text(
+                text,
+                preprocessing['combined_stopwords'],
+                preprocessing['normalization_dict'],
+                preprocessing['stemmer'],
+                preprocessing.get('tokenizer', 'fast'),
+                preprocessing.get('token_table')
+            )
+        except Exception as e:
+            preprocessed.append('')
+            errors.append(str(e))
+            continue
+        
+        preprocessed.append(result)
+        errors.append(None if result else 'Text kosong setelah preprocessing')
+    
+    return preprocessed, errors
+
+
+def _empty_columns(n):
+    """Kolom hasil default untuk n baris ('N/A', confidence 0)"""
+    import numpy as np
+    
+    return {
+        'sentiment': np.full(n, 'N/A', dtype=object),
+        'confidence': np.zeros(n),
+        'prob_negatif': np.zeros(n),
+        'prob_positif': np.zeros(n),
+    }
+
+
+def result_columns(labels, probabilities):
+    """Kolom hasil (persen) dari label dan probabilitas [negatif, positif]"""
+    import numpy as np
+    
+    n = len(labels)
+    if n == 0:
+        return _empty_columns(0)
+    
+    prediction = np.asarray(labels).astype(int)
+    return {
+        'sentiment': np.where(prediction == 1, 'Positif', 'Negatif').astype(object),
+        'confidence': probabilities[np.arange(n), prediction] * 100,
+        'prob_negatif': probabilities[:, 0] * 100,
+        'prob_positif': probabilities[:, 1] * 100,
+    }
+
+
+def score_features(features, model):
+    """Score sparse matrix fitur dengan NBScorer dalam satu pass
+
+    Return dict kolom NumPy: sentiment, confidence, prob_negatif,
+    prob_positif (dalam persen).
+    """
+    from .scoring import scorer_for
+    
+    if features.shape[0] == 0:
+        return _empty_columns(0)
+    
+    labels, probabilities = scorer_for(model).score(features)
+    return result_columns(labels, probabilities)
+
+
+def predict_sentiment_batch(texts, models_data, models=('word', 'trigram'), cache=None):
+    """Predict sentiment untuk banyak text sekaligus
+
+    Tiap text di-preprocess dan di-tokenisasi sekali, lalu tiap model di-score
+    dengan satu sparse matrix untuk seluruh batch. Hasil berbentuk kolom (NumPy array):
+
+        {
+            'preprocessed': array teks hasil preprocessing,
+            'success': array bool,
+            'error': array pesan error (None jika sukses),
+            'word': {'sentiment', 'confidence', 'prob_negatif', 'prob_positif'},
+            'trigram': {...},
+        }
+
+    Baris yang gagal mendapat sentiment 'N/A' dan confidence 0.
+
+    ``cache``: PredictionCache; default ``models_data.prediction_cache`` (jika ada),
+    ``False`` untuk mematikan. Teks yang sudah ada di cache untuk semua model
+    tidak di-vectorize maupun di-score.
+    """
+    import numpy as np
+    from .features import FusedVectorizer
+    from .scoring import scorer_for
+    
+    prefetch_models(models_data, models)
+    if cache is None:
+        cache = getattr(models_data, 'prediction_cache', None)
+    
+    texts = list(texts)
+    clock = time.perf_counter
+    start = clock()
+    preprocessed, errors = preprocess_batch(texts, models_data['preprocessing'])
+    preprocessed_at = clock()
+    
+    success = np.array([error is None for error in errors], dtype=bool)
+    valid_idx = np.flatnonzero(success)
+    valid_texts = [preprocessed[i] for i in valid_idx]
+    
+    results = {
+        'preprocessed': np.array(preprocessed, dtype=object),
+        'success': success,
+        'error': np.array(errors, dtype=object),
+    }
+    
+    labels = {name: np.zeros(len(valid_texts), dtype=int) for name in models}
+    probabilities = {name: np.zeros((len(valid_texts), 2)) for name in models}
+    
+    if metrics.enabled:
+        metrics.observe_stage('preprocess_batch', preprocessed_at - start)
+        metrics.REGISTRY.inc('sentiment_documents_total', len(texts))
+        metrics.REGISTRY.inc('sentiment_errors_total', len(texts) - len(valid_texts))
+    
+    # Ambil hasil yang sudah ada di cache; sisanya dihitung
+    pending = np.ones(len(valid_texts), dtype=bool)
+    cached = {}
+    if cache and valid_texts:
+        lookup_start = clock()
+        cached = {name: cache.get_many(name, valid_texts) for name in models}
+        pending = np.array(
+            [any(text not in cached[name] for name in models) for text in valid_texts],
+            dtype=bool
+        )
+        for name in models:
+            for i, text in enumerate(valid_texts):
+                hit = cached[name].get(text)
+                if hit is not None:
+                    labels[name][i] = hit[0]
+                    probabilities[name][i] = hit[1:]
+        if metrics.enabled:
+            metrics.observe_stage('cache_lookup', clock() - lookup_start)
+    
+    pending_idx = np.flatnonzero(pending)
+    if len(pending_idx):
+        # Tokenisasi + n-gram sekali untuk semua model
+        pending_texts = [valid_texts[i] for i in pending_idx]
+        vectorize_start = clock()
+        features = FusedVectorizer(
+            {name: models_data[MODEL_KEYS[name][1]] for name in models}
+        ).transform(pending_texts)
+        if metrics.enabled:
+            metrics.observe_stage('vectorize_batch', clock() - vectorize_start)
+        
+        for name in models:
+            score_start = clock()
+            scored_labels, scored_probabilities = scorer_for(
+                models_data[MODEL_KEYS[name][0]]
+            ).score(features[name])
+            if metrics.enabled:
+                metrics.observe_stage(f'score_{name}', clock() - score_start)
+            labels[name][pending_idx] = scored_labels.astype(int)
+            probabilities[name][pending_idx] = scored_probabilities
+            
+            if cache:
+                cache.put_many(name, (
+                    (pending_texts[j], labels[name][i], *probabilities[name][i])
+                    for j, i in enumerate(pending_idx)
+                    if pending_texts[j] not in cached[name]
+                ))
+    
+    for name in models:
+        scored = result_columns(labels[name], probabilities[name])
+        
+        # Sebar hasil ke posisi baris asli; baris gagal tetap 'N/A' / 0
+        columns = _empty_columns(len(texts))
+        for key, values in scored.items():
+            columns[key][valid_idx] = values
+        results[name] = columns
+    
+    return results
+
+
+def merge_batch_results(batches):
+    """Gabungkan beberapa hasil predict_sentiment_batch sesuai urutan"""
+    import numpy as np
+    
+    merged = {}
+    for key, value in batches[0].items():
+        if isinstance(value, dict):
+            merged[key] = {
+                column: np.concatenate([batch[key][column] for batch in batches])
+                for column in value
+            }
+        else:
+            merged[key] = np.concatenate([batch[key] for batch in batches])
+    return merged
+
+
+def take_batch_results(results, indices):
+    """Ambil baris ``indices`` dari hasil predict_sentiment_batch (boleh berulang)"""
+    taken = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            taken[key] = {column: values[indices] for column, values in value.items()}
+        else:
+            taken[key] = value[indices]
+    return taken
+
+
+def batch_result(results, index, model):
+    """Ambil hasil satu baris dari predict_sentiment_batch, format predict_sentiment"""
+    if not results['success'][index]:
+        return {'success': False, 'error': results['error'][index]}
+    
+    columns = results[model]
+    return {
+        'success': True,
+        'sentiment': columns['sentiment'][index],
+        'confidence': float(columns['confidence'][index]),
+        'prob_negatif': float(columns['prob_negatif'][index]),
+        'prob_positif': float(columns['prob_positif'][index]),
+        'preprocessed': results['preprocessed'][index]
+    }
@@ -1,52 +1,317 @@
 """Simple preprocessing functions"""
 
 import re
-import emoji
-from nltk.tokenize import word_tokenize
-import nltk
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+# Data NLTK hanya dipakai tokenizer 'nltk'. word_tokenize (nltk >= 3.8.2) cukup
+# punkt_tab. Folder vendored dan mode offline diatur lewat configure_nltk.
+NLTK_RESOURCES = ['punkt_tab']
+_nltk_data_dir = None
+_nltk_offline = False
+
+
+def configure_nltk(data_dir=None, offline=False):
+    """Set folder data NLTK vendored (dicari lebih dulu) dan larangan download"""
+    global _nltk_data_dir, _nltk_offline
+    _nltk_data_dir = data_dir
+    _nltk_offline = offline
+
 
-# Download NLTK data (untuk deployment)
 def download_nltk_data():
-    """Download NLTK data yang diperlukan"""
-    resources = ['punkt', 'punkt_tab']
-    for resource in resources:
+    """Pastikan data NLTK ada; download hanya jika belum ada dan tidak offline"""
+    import nltk
+    
+    if _nltk_data_dir and _nltk_data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, _nltk_data_dir)
+    for resource in NLTK_RESOURCES:
         try:
             nltk.data.find(f'tokenizers/{resource}')
         except LookupError:
+            if _nltk_offline:
+                raise LookupError(
+                    f"Data NLTK '{resource}' tidak ditemukan dan mode offline aktif; "
+                    f"jalankan python -m utils.vendor_nltk"
+                ) from None
             print(f"Downloading {resource}...")
-            nltk.download(resource, quiet=True)
+            nltk.download(resource, quiet=True, download_dir=_nltk_data_dir)
+
+
+class StemCache:
+    """Cache word -> stem (LRU, ukuran terbatas) di depan stemmer Sastrawi
+
+    Bisa dipakai langsung sebagai argumen ``stemmer`` di ``preprocess_text``.
+    Token yang sama tidak pernah di-stem dua kali selama masih di cache.
+    """
+
+    def __init__(self, stemmer, maxsize=100000):
+        # CachedStemmer Sastrawi menyimpan cache tanpa batas, jadi pakai stemmer aslinya
+        self.stemmer = getattr(stemmer, 'delegatedStemmer', stemmer)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_stemmer(cls, stemmer, maxsize=100000):
+        """Buat cache dan warm dari cache bawaan stemmer (vocabulary training)"""
+        cache = cls(stemmer, maxsize)
+        if hasattr(stemmer, 'get_cache'):
+            cache.warm(stemmer.get_cache().data)
+        return cache
+
+    def warm(self, stems):
+        """Isi cache dari mapping word -> stem tanpa menghitung hit/miss"""
+        with self._lock:
+            for word, stem in stems.items():
+                if len(self._cache) >= self.maxsize:
+                    break
+                self._cache[word] = stem
+
+    def stem(self, word):
+        """Stem word, pakai cache jika sudah pernah di-stem"""
+        with self._lock:
+            stem = self._cache.get(word)
+            if stem is not None:
+                self._cache.move_to_end(word)
+                self.hits += 1
+                return stem
+        
+        stem = self.stemmer.stem(word)
+        
+        with self._lock:
+            self.misses += 1
+            self._cache[word] = stem
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return stem
+
+    def stats(self):
+        """Statistik cache: hits, misses, evictions, size, hit_rate"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._cache),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+# Regex cleaning di-compile sekali. Pola yang urutannya tidak saling
+# mempengaruhi digabung jadi satu pass; hasilnya identik dengan 13 re.sub
+# berurutan versi lama (kecuali ':kata:' biasa yang dulu ikut terhapus):
+#   emoji                      -> ' ' (strip_emoji, lihat di bawah)
+#   tag HTML                   -> ' '
+#   URL                        -> ''   (harus sebelum email/mention)
+#   email, @mention, #hashtag, RT, angka -> ''
+#   non-huruf (termasuk whitespace) -> ' ', lalu huruf berulang >2 -> 2
+_HTML_RE = re.compile(r'<[^>]+>')
+_URL_RE = re.compile(r'http\S+|www\S+')
+_ENTITY_RE = re.compile(r'\S+@\S+|@\w+|#\w+|\b(?i:RT)\b|\d+')
+_ENTITY_NO_AT_RE = re.compile(r'#\w+|\b(?i:RT)\b|\d+')
+_NON_ALPHA_RE = re.compile(r'[^a-z]+')
+_REPEAT_RE = re.compile(r'([a-z])\1{2,}')
+
+
+def _emoji_tables():
+    """Tabel emoji (termasuk sequence ZWJ/skin tone/bendera) -> pengganti
+
+    Sama dengan demojize lalu hapus ``:nama:``: emoji yang namanya cocok
+    [a-z_]+ jadi ' '; sisanya (bendera, keycap, nama beraksen) tetap jadi
+    ``:Nama:`` seperti hasil demojize, supaya token yang masuk model sama.
+    Juga return panjang sequence per karakter awal (terpanjang dulu) dan
+    character class yang mencakup semua karakter awal.
+    """
+    import emoji
+    
+    replacements = {}
+    lengths = {}
+    for sequence, data in emoji.EMOJI_DATA.items():
+        name = data['en']
+        replacements[sequence] = ' ' if re.fullmatch(r':[a-z_]+:', name) else name
+        lengths.setdefault(sequence[0], set()).add(len(sequence))
+    lengths = {char: sorted(values, reverse=True) for char, values in lengths.items()}
+    
+    # Karakter awal non-ASCII digabung jadi beberapa range lebar (class kecil =
+    # scan cepat); karakter lain di dalam range cukup gagal di lookup tabel.
+    # Karakter awal ASCII hanya keycap (#, *, 0-9).
+    ranges = []
+    for code in sorted(ord(char) for char in lengths if not char.isascii()):
+        if ranges and code - ranges[-1][1] < 256:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    ascii_starts = ''.join(re.escape(char) for char in sorted(lengths) if char.isascii())
+    char_class = '[' + ascii_starts + ''.join(
+        re.escape(chr(first)) + ('-' + re.escape(chr(last)) if last != first else '')
+        for first, last in ranges
+    ) + ']'
+    return replacements, lengths, re.compile(char_class)
+
+
+# Dibangun saat teks non-ASCII pertama, bukan saat import (library emoji ~40 ms)
+_emoji_state = None
+
+
+def strip_emoji(text):
+    """Ganti emoji dengan spasi (atau nama, lihat _emoji_tables) tanpa demojize
+
+    Tiap kandidat posisi dicek ke tabel, sequence terpanjang menang seperti
+    tokenizer library emoji. Semua emoji mengandung karakter non-ASCII,
+    jadi teks ASCII langsung dilewati.
+    """
+    global _emoji_state
+    
+    if text.isascii():
+        return text
+    if _emoji_state is None:
+        _emoji_state = _emoji_tables()
+    replacements, lengths, start_re = _emoji_state
+    
+    pieces = []
+    end = 0
+    for match in start_re.finditer(text):
+        start = match.start()
+        if start < end:
+            continue
+        for length in lengths.get(text[start], ()):
+            replacement = replacements.get(text[start:start + length])
+            if replacement is not None:
+                pieces.append(text[end:start])
+                pieces.append(replacement)
+                end = start + length
+                break
+    
+    if not pieces:
+        return text
+    pieces.append(text[end:])
+    return ''.join(pieces)
+
+
+def clean_text(text):
+    """Cleaning + casefolding: hapus emoji, URL/email/mention/hashtag/RT/angka/HTML"""
+    return clean_stripped(strip_emoji(text))
+
 
-# Download saat import
-download_nltk_data()
+def clean_stripped(text):
+    """Bagian clean_text setelah strip_emoji (regex cleaning + casefolding)"""
+    if '<' in text:
+        text = _HTML_RE.sub(' ', text)
+    if 'http' in text or 'www' in text:
+        text = _URL_RE.sub('', text)
+    # Pola email mahal (backtracking per posisi), lewati jika tidak ada '@'
+    if '@' in text:
+        text = _ENTITY_RE.sub('', text)
+    else:
+        text = _ENTITY_NO_AT_RE.sub('', text)
+    
+    # Casefolding
+    text = text.lower()
+    text = _NON_ALPHA_RE.sub(' ', text)
+    text = _REPEAT_RE.sub(r'\1\1', text)
+    return text.strip()
+
+
+# Setelah clean_text teks hanya berisi a-z dan spasi tunggal. Untuk alfabet ini
+# word_tokenize NLTK identik dengan str.split, kecuali kontraksi Inggris yang
+# tetap dipecah oleh NLTKWordTokenizer (CONTRACTIONS2 tanpa apostrof).
+_CONTRACTIONS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+}
+_CONTRACTION_RE = re.compile(r'\b(?:%s)\b' % '|'.join(_CONTRACTIONS))
+
+_nltk_word_tokenize = None
+
+
+def nltk_tokenize(text):
+    """Tokenisasi dengan NLTK word_tokenize (butuh data punkt)"""
+    global _nltk_word_tokenize
+    
+    if _nltk_word_tokenize is None:
+        from nltk.tokenize import word_tokenize
+        download_nltk_data()
+        _nltk_word_tokenize = word_tokenize
+    return _nltk_word_tokenize(text)
+
+
+def fast_tokenize(text):
+    """Tokenisasi teks hasil clean_text tanpa NLTK, hasil sama dengan word_tokenize"""
+    tokens = text.split()
+    if _CONTRACTION_RE.search(text) is None:
+        return tokens
+    
+    result = []
+    for token in tokens:
+        result.extend(_CONTRACTIONS.get(token, (token,)))
+    return result
+
+
+TOKENIZERS = {
+    'fast': fast_tokenize,
+    'nltk': nltk_tokenize,
+}
+
+
+def process_token(word, stopwords, norm_dict, stemmer):
+    """Jalur live untuk satu token: normalisasi, stopword/panjang, stem (None = dibuang)"""
+    word = norm_dict.get(word, word)
+    if word in stopwords or len(word) <= 2:
+        return None
+    return stemmer.stem(word)
 
 
-def preprocess_text(text, stopwords, norm_dict, stemmer):
-    """Preprocess text untuk sentiment analysis"""
+# Penanda token yang tidak ada di token table
+_MISSING = object()
+
+
+def apply_token_table(tokens, token_table, stopwords, norm_dict, stemmer):
+    """Normalisasi + stopword + stem dalam satu lookup per token; token baru lewat process_token"""
+    output = []
+    for word in tokens:
+        result = token_table.get(word, _MISSING)
+        if result is _MISSING:
+            result = process_token(word, stopwords, norm_dict, stemmer)
+        if result is not None:
+            output.append(result)
+    return output
+
+
+def preprocess_text(text, stopwords, norm_dict, stemmer, tokenizer='fast', token_table=None):
+    """Preprocess text untuk sentiment analysis
+
+    ``tokenizer``: 'fast' (split biasa, default) atau 'nltk' (word_tokenize).
+    ``token_table``: hasil utils.token_table (token -> kata hasil stem / None);
+    hasilnya identik dengan jalur normalisasi -> stopword -> stem biasa.
+    """
     
     if not text:
         return ''
     
     text = str(text)
     
-    # Cleaning
-    text = emoji.demojize(text)
-    text = re.sub(r':[a-z_]+:', ' ', text)
-    text = re.sub(r'<[^>]+>', ' ', text)
-    text = re.sub(r'http\S+|www\S+', '', text)
-    text = re.sub(r'\S+@\S+', '', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'#\w+', '', text)
-    text = re.sub(r'\bRT\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\d+', '', text)
+    if metrics.enabled:
+        return _preprocess_text_timed(text, stopwords, norm_dict, stemmer, tokenizer, token_table)
     
-    # Casefolding
-    text = text.lower()
-    text = re.sub(r'[^a-z\s]', ' ', text)
-    text = re.sub(r'(.)\1{2,}', r'\1\1', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = clean_text(text)
     
     # Tokenization
-    tokens = word_tokenize(text)
+    tokens = TOKENIZERS[tokenizer](text)
+    
+    if token_table is not None:
+        return ' '.join(apply_token_table(tokens, token_table, stopwords, norm_dict, stemmer))
     
     # Normalization
     tokens = [norm_dict.get(word, word) for word in tokens]
@@ -58,3 +323,40 @@ def preprocess_text(text, stopwords, norm_dict, stemmer):
     tokens = [stemmer.stem(word) for word in tokens]
     
     return ' '.join(tokens)
+
+
+def _preprocess_text_timed(text, stopwords, norm_dict, stemmer, tokenizer, token_table=None):
+    """preprocess_text dengan waktu per tahap dan jumlah token dicatat ke metrics"""
+    clock = time.perf_counter
+    start = clock()
+    
+    text = strip_emoji(text)
+    t_emoji = clock()
+    text = clean_stripped(text)
+    t_clean = clock()
+    tokens = TOKENIZERS[tokenizer](text)
+    t_tokenize = clock()
+    
+    metrics.observe_stage('strip_emoji', t_emoji - start)
+    metrics.observe_stage('clean', t_clean - t_emoji)
+    metrics.observe_stage('tokenize', t_tokenize - t_clean)
+    
+    if token_table is not None:
+        tokens = apply_token_table(tokens, token_table, stopwords, norm_dict, stemmer)
+        metrics.observe_stage('token_table', clock() - t_tokenize)
+    else:
+        tokens = [norm_dict.get(word, word) for word in tokens]
+        t_normalize = clock()
+        tokens = [word for word in tokens if word not in stopwords and len(word) > 2]
+        t_stopwords = clock()
+        tokens = [stemmer.stem(word) for word in tokens]
+        t_stem = clock()
+        
+        metrics.observe_stage('normalize', t_normalize - t_tokenize)
+        metrics.observe_stage('stopwords', t_stopwords - t_normalize)
+        metrics.observe_stage('stem', t_stem - t_stopwords)
+    
+    metrics.REGISTRY.observe('sentiment_tokens', len(tokens), buckets=metrics.COUNT_BUCKETS)
+    metrics.REGISTRY.inc('sentiment_tokens_total', len(tokens))
+    
+    return ' '.join(tokens)
@@ -0,0 +1,172 @@
+"""Varian compact + pruned untuk pasangan vectorizer/NB (default: trigram)
+
+N-gram yang selisih ``feature_log_prob_`` antar kelasnya kecil hampir tidak
+mempengaruhi keputusan Naive Bayes, jadi dibuang. Hasilnya ditulis dalam
+format compact (vocabulary array terurut, tanpa dict Python), lalu
+dibandingkan dengan model asli: agreement, selisih probabilitas, akurasi
+(jika ada label), dan memory/disk yang dihemat.
+
+Contoh:
+    python -m utils.prune --keep 0.5
+    python -m utils.prune --threshold 0.05 --eval data.csv --label-column label
+
+Pakai di app: config.MODEL_VARIANTS = {'trigram': 'models/pruned/trigram'}
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+import joblib
+import numpy as np
+
+import config
+from .compact import CompactNB, CompactVectorizer, export_pair
+from .model_loader import (
+    ARTIFACTS, MODEL_KEYS, _path_size, _prepare_preprocessing, deep_sizeof, preprocess_batch
+)
+from .scoring import scorer_for
+
+
+def select_features(model, keep=None, threshold=None):
+    """Index kolom yang dipertahankan
+
+    ``threshold``: selisih log-prob antar kelas minimum; ``keep``: fraksi
+    kolom dengan selisih terbesar (0..1). Salah satu wajib diisi.
+    """
+    spread = np.ptp(model.feature_log_prob_, axis=0)
+    if threshold is not None:
+        return np.flatnonzero(spread >= threshold)
+    if keep is None or not 0 < keep <= 1:
+        raise ValueError("Isi threshold atau keep (0 < keep <= 1)")
+    count = math.ceil(keep * len(spread))
+    return np.sort(np.argsort(-spread, kind='stable')[:count])
+
+
+def evaluate(preprocessing, original, variant, texts, labels=None):
+    """Bandingkan dua pasangan (vectorizer, model) pada texts yang sama"""
+    preprocessed, errors = preprocess_batch(texts, preprocessing)
+    valid = [i for i, error in enumerate(errors) if error is None]
+    documents = [preprocessed[i] for i in valid]
+    
+    predictions = []
+    for vectorizer, model in (original, variant):
+        predictions.append(scorer_for(model).score(vectorizer.transform(documents)))
+    (labels_a, proba_a), (labels_b, proba_b) = predictions
+    
+    report = {
+        'documents': len(documents),
+        'agreement': float(np.mean(labels_a == labels_b)) if documents else None,
+        'mean_abs_prob_diff': float(np.mean(np.abs(proba_a - proba_b))) if documents else None,
+        'max_abs_prob_diff': float(np.max(np.abs(proba_a - proba_b))) if documents else None,
+    }
+    if labels is not None and documents:
+        truth = np.asarray([labels[i] for i in valid])
+        report['accuracy_original'] = float(np.mean(labels_a == truth))
+        report['accuracy_variant'] = float(np.mean(labels_b == truth))
+        report['accuracy_delta'] = report['accuracy_variant'] - report['accuracy_original']
+    return report
+
+
+def parse_labels(values, classes):
+    """Label file evaluasi -> nilai kelas model (angka, atau 'positif'/'negatif')"""
+    names = {'negatif': classes[0], 'positif': classes[-1]}
+    parsed = []
+    for value in values:
+        if isinstance(value, str) and value.strip().lower() in names:
+            parsed.append(names[value.strip().lower()])
+        else:
+            parsed.append(type(classes[0])(value))
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.prune',
+        description='Buat varian compact + pruned dari model joblib dan laporkan dampaknya'
+    )
+    parser.add_argument('--model', choices=list(MODEL_KEYS), default='trigram', help='Model (default: trigram)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--keep', type=float, default=0.5, help='Fraksi fitur yang dipertahankan (default: 0.5)')
+    group.add_argument('--threshold', type=float, help='Selisih log-prob antar kelas minimum')
+    parser.add_argument('--output', help='Folder output (default: models/pruned/<model>)')
+    parser.add_argument('--eval', help='File evaluasi (csv/jsonl/parquet); default corpus sintetis')
+    parser.add_argument('--text-column', help="Kolom teks file evaluasi (default: 'text' atau 'review')")
+    parser.add_argument('--label-column', help='Kolom label file evaluasi untuk menghitung akurasi')
+    parser.add_argument('--corpus-size', type=int, default=5000, help='Jumlah dokumen corpus sintetis')
+    args = parser.parse_args(argv)
+    
+    model_key, vectorizer_key = MODEL_KEYS[args.model]
+    vectorizer = joblib.load(getattr(config, ARTIFACTS[vectorizer_key]))
+    model = joblib.load(getattr(config, ARTIFACTS[model_key]))
+    preprocessing = _prepare_preprocessing(joblib.load(config.PREPROCESSING_PATH), config)
+    output = args.output or os.path.join(config.MODELS_DIR, 'pruned', args.model)
+    
+    keep = select_features(model, None if args.threshold is not None else args.keep, args.threshold)
+    export_pair(vectorizer, model, output, args.model, keep=keep)
+    variant = (CompactVectorizer(output, mmap_mode=None), CompactNB(output, mmap_mode=None))
+    
+    labels = None
+    if args.eval:
+        import pandas as pd
+        from .bulk import find_text_column, text_values
+        from .cli import detect_format
+        
+        fmt = detect_format(args.eval)
+        df = {'csv': pd.read_csv, 'jsonl': lambda path: pd.read_json(path, lines=True),
+              'parquet': pd.read_parquet}[fmt](args.eval)
+        text_column = args.text_column or find_text_column(df.columns)
+        if text_column not in df.columns:
+            parser.error("File evaluasi harus memiliki kolom 'text' atau 'review' (atau pakai --text-column)")
+        texts = text_values(df[text_column]).tolist()
+        if args.label_column:
+            labels = parse_labels(df[args.label_column].tolist(), model.classes_)
+        source = args.eval
+    else:
+        from .benchmark import generate_corpus
+        
+        texts = generate_corpus(preprocessing, args.corpus_size)
+        source = 'synthetic'
+    
+    original_files = [getattr(config, ARTIFACTS[key]) for key in (vectorizer_key, model_key)]
+    report = {
+        'model': args.model,
+        'output': output,
+        'features_original': len(vectorizer.idf_),
+        'features_variant': len(keep),
+        'memory_bytes_original': deep_sizeof(vectorizer) + deep_sizeof(model),
+        'memory_bytes_variant': deep_sizeof(variant[0]) + deep_sizeof(variant[1]),
+        'file_bytes_original': sum(_path_size(path) for path in original_files),
+        'file_bytes_variant': _path_size(output),
+        'evaluation': {'source': source, **evaluate(preprocessing, (vectorizer, model), variant, texts, labels)},
+    }
+    with open(os.path.join(output, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    
+    evaluation = report['evaluation']
+    print(f"Fitur: {report['features_original']} -> {report['features_variant']}", file=sys.stderr)
+    print(
+        f"Memory: {report['memory_bytes_original'] / 1e6:.2f} MB -> {report['memory_bytes_variant'] / 1e6:.2f} MB, "
+        f"file: {report['file_bytes_original'] / 1e6:.2f} MB -> {report['file_bytes_variant'] / 1e6:.2f} MB",
+        file=sys.stderr
+    )
+    if evaluation['documents']:
+        print(
+            f"Agreement: {evaluation['agreement'] * 100:.2f}% dari {evaluation['documents']} dokumen ({source}), "
+            f"selisih probabilitas rata-rata {evaluation['mean_abs_prob_diff']:.4f}",
+            file=sys.stderr
+        )
+    if 'accuracy_delta' in evaluation:
+        print(
+            f"Akurasi: {evaluation['accuracy_original'] * 100:.2f}% -> {evaluation['accuracy_variant'] * 100:.2f}% "
+            f"({evaluation['accuracy_delta'] * 100:+.2f} poin)",
+            file=sys.stderr
+        )
+    print(f"Varian ditulis ke {output}; aktifkan dengan MODEL_VARIANTS = {{'{args.model}': ...}}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Scoring Naive Bayes langsung dengan NumPy"""
+
+import weakref
+
+import numpy as np
+
+
+def joint_log_likelihood(X, feature_log_prob, class_log_prior):
+    """``X @ feature_log_prob.T + class_log_prior`` tanpa menyalin feature_log_prob
+
+    ``X @ feature_log_prob.T`` membuat salinan array (n_features, n_classes) di
+    tiap panggilan. Satu sparse mat-vec per baris kelas memakai array apa adanya,
+    jadi file mmap compact tetap dibagi antar process.
+    """
+    jll = np.empty((X.shape[0], len(class_log_prior)), dtype=np.float64)
+    for index, row in enumerate(feature_log_prob):
+        jll[:, index] = X @ row
+    jll += class_log_prior
+    return jll
+
+
+class NBScorer:
+    """Scorer MultinomialNB tanpa overhead sklearn per panggilan
+
+    Joint log-likelihood dihitung sebagai satu perkalian sparse x dense
+    (``X @ feature_log_prob_.T + class_log_prior_``, lihat joint_log_likelihood),
+    lalu softmax stabil.
+    Label dan probabilitas keluar dari satu pass yang sama.
+    """
+
+    def __init__(self, class_log_prior, feature_log_prob, classes):
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float64)
+        # Tetap (n_classes, n_features) tanpa salinan: view dari array model / mmap
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float64)
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_model(cls, model):
+        """Buat scorer dari MultinomialNB (sklearn atau CompactNB)"""
+        return cls(model.class_log_prior_, model.feature_log_prob_, model.classes_)
+
+    def joint_log_likelihood(self, X):
+        return joint_log_likelihood(X, self.feature_log_prob, self.class_log_prior)
+
+    def score(self, X):
+        """Return (labels, probabilities) untuk setiap baris X"""
+        jll = self.joint_log_likelihood(X)
+        
+        # Softmax stabil: geser dengan nilai maksimum per baris
+        jll -= jll.max(axis=1, keepdims=True)
+        probabilities = np.exp(jll)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        
+        labels = self.classes.take(probabilities.argmax(axis=1))
+        return labels, probabilities
+
+
+# Satu scorer per object model, ikut terhapus saat model di-garbage-collect
+_scorers = weakref.WeakKeyDictionary()
+
+
+def scorer_for(model):
+    """NBScorer (di-cache) untuk model"""
+    scorer = _scorers.get(model)
+    if scorer is None:
+        scorer = _scorers[model] = NBScorer.from_model(model)
+    return scorer
@@ -0,0 +1,236 @@
+"""HTTP inference server dengan micro-batching
+
+Endpoint (JSON):
+    POST /predict        {"text": "...", "model": "word" | "trigram" | "both"}
+    POST /predict_batch  {"texts": ["...", ...], "model": "both"}
+    GET  /health
+    GET  /metrics        teks Prometheus (isi per tahap jika METRICS_ENABLED / --metrics)
+
+Jalankan: python -m utils.server --port 8000
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+from . import metrics
+from .model_loader import MODEL_CHOICES, MODEL_KEYS, batch_result, load_models, predict_sentiment_batch
+
+class MicroBatcher:
+    """Kumpulkan request single-text dari banyak thread lalu score sekaligus
+
+    Request pertama membuka window ``max_wait`` detik; semua text yang masuk
+    selama window itu (maksimal ``max_batch``) di-score dengan satu
+    ``predict_sentiment_batch``, yaitu satu transform + scoring per model.
+    Batch hanya men-score gabungan model yang diminta request di dalamnya,
+    jadi batch berisi request word-only tidak me-load / men-score trigram.
+    """
+
+    def __init__(self, models_data, max_batch=256, max_wait=0.005):
+        self.models_data = models_data
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text, models=MODEL_CHOICES['both']):
+        """Masukkan text ke antrian, return Future berisi (hasil predict_sentiment_batch, index baris)
+
+        Hasil berisi minimal ``models``; ambil yang diminta saja (format_result).
+        """
+        future = Future()
+        self._queue.put((text, models, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # Teruskan sinyal stop setelah batch ini selesai
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            
+            batch = self._collect(first)
+            requested = {model for _, models, _ in batch for model in models}
+            models = tuple(model for model in MODEL_KEYS if model in requested)
+            try:
+                results = predict_sentiment_batch([text for text, _, _ in batch], self.models_data, models)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.texts += len(batch)
+            for index, (_, _, future) in enumerate(batch):
+                future.set_result((results, index))
+
+
+def format_result(results, index, models):
+    """Hasil satu text untuk response JSON: {model: hasil predict_sentiment}"""
+    return {model: batch_result(results, index, model) for model in models}
+
+
+class SentimentHandler(BaseHTTPRequestHandler):
+    """Handler HTTP; ``server.models_data`` dan ``server.batcher`` di-set oleh make_server"""
+    
+    server_version = 'DanantaraSentiment/1.0'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status, text, content_type='text/plain; charset=utf-8'):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path == '/health':
+            batcher = self.server.batcher
+            self._send_json(200, {
+                'status': 'ok',
+                'micro_batches': batcher.batches,
+                'micro_batched_texts': batcher.texts
+            })
+        elif self.path == '/metrics':
+            self._send_text(200, metrics.REGISTRY.render(), 'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+        except ValueError:
+            payload = None
+        # Body JSON harus object; 'model' harus string sebelum dipakai sebagai key
+        model = payload.get('model', 'both') if isinstance(payload, dict) else None
+        if not isinstance(model, str) or model not in MODEL_CHOICES:
+            self._send_json(400, {'error': "Body harus JSON object dengan model 'word', 'trigram', atau 'both'"})
+            return
+        models = MODEL_CHOICES[model]
+        
+        if self.path == '/predict':
+            text = payload.get('text')
+            if not isinstance(text, str):
+                self._send_json(400, {'error': "Field 'text' (string) wajib diisi"})
+                return
+            try:
+                results, index = self.server.batcher.submit(text, models).result()
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+                return
+            self._send_json(200, format_result(results, index, models))
+        
+        elif self.path == '/predict_batch':
+            texts = payload.get('texts')
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                self._send_json(400, {'error': "Field 'texts' (list of string) wajib diisi"})
+                return
+            try:
+                results = predict_sentiment_batch(texts, self.server.models_data, models)
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+                return
+            self._send_json(200, {
+                'results': [format_result(results, index, models) for index in range(len(texts))]
+            })
+        
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def log_message(self, format, *args):
+        # Akses log per request terlalu berisik pada QPS tinggi
+        pass
+
+
+class SentimentServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog default (5) terlalu kecil untuk banyak koneksi bersamaan
+    request_queue_size = 128
+
+
+def make_server(models_data, host=None, port=None):
+    """Buat SentimentServer dengan MicroBatcher di atas models_data"""
+    server = SentimentServer(
+        (host or config.SERVER_HOST, config.SERVER_PORT if port is None else port),
+        SentimentHandler
+    )
+    server.models_data = models_data
+    server.batcher = MicroBatcher(
+        models_data,
+        max_batch=config.MICROBATCH_MAX_SIZE,
+        max_wait=config.MICROBATCH_MAX_WAIT_MS / 1000
+    )
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m utils.server', description='HTTP sentiment inference server')
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT)
+    parser.add_argument('--metrics', action='store_true', default=config.METRICS_ENABLED,
+                        help='Catat waktu per tahap untuk /metrics (default: config.METRICS_ENABLED)')
+    args = parser.parse_args(argv)
+    metrics.enable(args.metrics)
+    
+    # Server: load semua artifact paralel di awal supaya request pertama tidak lambat
+    models_data = load_models(config, lazy=False)
+    if not models_data['loaded']:
+        print(f"Gagal load model: {models_data['error']}", file=sys.stderr)
+        return 1
+    
+    server = make_server(models_data, args.host, args.port)
+    print(f"Listening on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Laporan waktu startup app: import modul berat dan render pertama
+
+Streamlit menjalankan ulang script di tiap interaksi, tapi modul ini hanya
+di-import sekali per process, jadi yang tercatat adalah run pertama.
+"""
+
+import importlib
+import sys
+import time
+
+_imports = {}
+_first_render = None
+
+
+def timed_import(name):
+    """``importlib.import_module(name)``; waktu dicatat jika baru pertama di process ini"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def record_import(name, seconds):
+    """Catat waktu import blok ``name`` (mis. import di awal script), sekali saja"""
+    _imports.setdefault(name, seconds)
+
+
+def record_first_render(seconds):
+    """Catat durasi run script pertama; return True jika ini run pertama"""
+    global _first_render
+    if _first_render is not None:
+        return False
+    _first_render = seconds
+    return True
+
+
+def report():
+    """{'imports': {nama: detik}, 'first_render': detik atau None}"""
+    return {'imports': dict(_imports), 'first_render': _first_render}
+
+
+def format_report():
+    """Satu baris ringkas untuk log"""
+    data = report()
+    parts = [f"{name} {seconds:.2f}s" for name, seconds in data['imports'].items()]
+    render = f"{data['first_render']:.2f}s" if data['first_render'] is not None else '-'
+    return f"Startup: render pertama {render}; import: {', '.join(parts) or '-'}"
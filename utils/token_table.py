@@ -0,0 +1,96 @@
+"""Tabel token -> hasil normalisasi + stopword + stem yang dihitung di depan
+
+Untuk tiap token vocabulary training (cache stemmer Sastrawi, key kamus
+normalisasi, stopword) disimpan hasil akhirnya: kata hasil stem, atau None
+jika token dibuang (stopword / terlalu pendek). preprocess_text cukup satu
+dict lookup per token; token di luar tabel tetap lewat jalur live.
+
+Tabel terikat ke isi preprocessing_tools.joblib (sha1); jika file itu
+berubah, tabel lama diabaikan sampai dibuat ulang.
+
+Buat ulang: python -m utils.token_table [--output models/token_table.joblib]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+import joblib
+
+from .preprocessing import process_token
+
+FORMAT_VERSION = 1
+
+
+def file_sha1(path):
+    """sha1 isi file (hex)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def training_vocabulary(preprocessing):
+    """Token yang dikenal dari artifact preprocessing (terurut)"""
+    stemmer = preprocessing['stemmer']
+    vocabulary = set(preprocessing['normalization_dict']) | set(preprocessing['combined_stopwords'])
+    if hasattr(stemmer, 'get_cache'):
+        vocabulary |= set(stemmer.get_cache().data)
+    return sorted(vocabulary)
+
+
+def build_token_table(preprocessing):
+    """Hitung hasil jalur live (process_token) untuk seluruh training_vocabulary"""
+    stopwords = preprocessing['combined_stopwords']
+    norm_dict = preprocessing['normalization_dict']
+    stemmer = preprocessing['stemmer']
+    return {
+        token: process_token(token, stopwords, norm_dict, stemmer)
+        for token in training_vocabulary(preprocessing)
+    }
+
+
+def save_token_table(table, path, source_sha1):
+    joblib.dump(
+        {'version': FORMAT_VERSION, 'source_sha1': source_sha1, 'table': table},
+        path,
+        compress=3
+    )
+
+
+def load_token_table(path, preprocessing_path):
+    """Load tabel jika ada dan dibuat dari preprocessing_path yang sama, selain itu None"""
+    if not path or not os.path.exists(path):
+        return None
+    artifact = joblib.load(path)
+    if artifact.get('version') != FORMAT_VERSION:
+        return None
+    if artifact.get('source_sha1') != file_sha1(preprocessing_path):
+        print(f"Token table {path} tidak cocok dengan {preprocessing_path}, diabaikan", file=sys.stderr)
+        return None
+    return artifact['table']
+
+
+def main(argv=None):
+    import config
+    
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.token_table',
+        description='Buat tabel token -> hasil preprocessing dari preprocessing_tools.joblib'
+    )
+    parser.add_argument('--output', default=config.TOKEN_TABLE_PATH, help='File output (default: config.TOKEN_TABLE_PATH)')
+    args = parser.parse_args(argv)
+    
+    preprocessing = joblib.load(config.PREPROCESSING_PATH)
+    table = build_token_table(preprocessing)
+    save_token_table(table, args.output, file_sha1(config.PREPROCESSING_PATH))
+    
+    dropped = sum(1 for value in table.values() if value is None)
+    print(f"{len(table)} token ({dropped} dibuang) ditulis ke {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
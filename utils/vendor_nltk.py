@@ -0,0 +1,71 @@
+"""Vendor data NLTK ke folder project supaya tokenizer 'nltk' jalan tanpa network
+
+Jalankan sekali di mesin yang punya akses internet (mis. saat build image),
+lalu bawa folder hasilnya ke pod air-gapped dan set config.OFFLINE = True.
+
+Contoh:
+    python -m utils.vendor_nltk
+    python -m utils.vendor_nltk --output /opt/app/nltk_data
+    python -m utils.vendor_nltk --check
+"""
+
+import argparse
+import os
+import sys
+
+import config
+from .preprocessing import NLTK_RESOURCES
+
+
+def _dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def missing_resources(data_dir):
+    """Resource NLTK_RESOURCES yang tidak ada di ``data_dir`` (hanya folder itu)"""
+    import nltk
+    
+    missing = []
+    for resource in NLTK_RESOURCES:
+        try:
+            nltk.data.find(f'tokenizers/{resource}', paths=[data_dir])
+        except LookupError:
+            missing.append(resource)
+    return missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.vendor_nltk',
+        description='Download data NLTK untuk tokenizer nltk ke folder vendored'
+    )
+    parser.add_argument('--output', default=config.NLTK_DATA_DIR, help='Folder tujuan (default: config.NLTK_DATA_DIR)')
+    parser.add_argument('--check', action='store_true', help='Hanya cek kelengkapan folder, tanpa download')
+    args = parser.parse_args(argv)
+    
+    if not args.check:
+        import nltk
+        
+        os.makedirs(args.output, exist_ok=True)
+        for resource in NLTK_RESOURCES:
+            if not nltk.download(resource, download_dir=args.output, quiet=True):
+                print(f"Gagal download {resource}", file=sys.stderr)
+                return 1
+    
+    missing = missing_resources(args.output)
+    if missing:
+        print(f"Belum ada di {args.output}: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    print(
+        f"Data NLTK lengkap di {args.output} ({_dir_size(args.output) / 1e6:.1f} MB): {', '.join(NLTK_RESOURCES)}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())